@@ -0,0 +1,155 @@
+import numpy as np
+from engine import Engine, NEIGHBORS, step_field
+from entity_store import EntityKind
+
+NEIGHBOR_DX = np.array([dx for dx, _ in NEIGHBORS])
+NEIGHBOR_DY = np.array([dy for _, dy in NEIGHBORS])
+
+class BatchEngine:
+    """
+    Runs many copies of an engine's level at once, one row per candidate, so thousands of timelines can be played together.
+    Each beat is stepped for every row with NumPy, mirroring Engine.move_player, Entity.move and the enemies' turns
+    (but without any sounds). The terrain is shared between rows; only the entities differ.
+    """
+    size: int
+    "How many rows there are."
+    width: int
+    height: int
+    solid: np.ndarray
+    pit: np.ndarray
+    walkable: np.ndarray
+    kind: np.ndarray
+    "The EntityKind of each entity, which is the same in every row."
+    x: np.ndarray
+    "Indexed [row, entity id], like the rest of the entity columns."
+    y: np.ndarray
+    health: np.ndarray
+    open: np.ndarray
+    alive: np.ndarray
+    player: int | None
+    "The player's entity id."
+    enemies: np.ndarray
+    "The ids of every enemy, in the order they take their turns."
+    doors: np.ndarray
+    step_fields: dict[int, np.ndarray]
+    "Flattened step_fields towards the player, by the flat index of the player's cell, or -1 for when there's no way to the player."
+
+    def __init__(self, engine: Engine, size: int):
+        self.size = size
+        self.width, self.height = engine.world_width, engine.world_height
+        self.solid = engine.solid.copy()
+        self.pit = engine.pit.copy()
+        self.walkable = engine.walkable.copy()
+
+        state = engine.export_state()
+        self.kind = np.array(state.kind, dtype=np.int8)
+        self.x = np.tile(np.array(state.x, dtype=np.int32), (size, 1))
+        self.y = np.tile(np.array(state.y, dtype=np.int32), (size, 1))
+        self.health = np.tile(np.array(state.health, dtype=np.int32), (size, 1))
+        self.open = np.tile(np.array(state.open, dtype=bool), (size, 1))
+        self.alive = np.tile(np.array(state.alive, dtype=bool), (size, 1))
+
+        self.player = engine.player.id if engine.player is not None else None
+        self.enemies = np.flatnonzero(self.kind == EntityKind.ENEMY)
+        self.doors = np.flatnonzero(self.kind == EntityKind.DOOR)
+        self.step_fields = dict()
+
+    def player_dead(self) -> np.ndarray:
+        if self.player is None:
+            return np.zeros(self.size, dtype=bool)
+        return self.health[:, self.player] <= 0
+
+    def all_enemies_dead(self) -> np.ndarray:
+        return ~(self.alive[:, self.enemies] & (self.health[:, self.enemies] > 0)).any(axis=1)
+
+    def step(self, dx: np.ndarray, dy: np.ndarray, acting: np.ndarray):
+        """Runs a turn on every row where acting is set, with the player moving by (dx, dy). Rows without a move don't get a turn at all."""
+        if self.player is None:
+            return
+        rows = np.flatnonzero(acting)
+        if rows.size == 0:
+            return
+
+        self.move_player(rows, dx[rows], dy[rows])
+        self.enemy_turns(rows)
+
+    def blockers(self, rows: np.ndarray, x: np.ndarray, y: np.ndarray, mover: int) -> np.ndarray:
+        """Which entities stop mover from stepping onto (x, y) in each row, indexed [row, entity id] like Engine.blocking_entity_at"""
+        blocking = (
+            self.alive[rows]
+            & (self.x[rows] == x[:, None])
+            & (self.y[rows] == y[:, None])
+            & ~((self.kind == EntityKind.DOOR) & self.open[rows])
+        )
+        blocking[:, mover] = False
+        return blocking
+
+    def move_player(self, rows: np.ndarray, dx: np.ndarray, dy: np.ndarray):
+        player = self.player
+        x = self.x[rows, player] + dx
+        y = self.y[rows, player] + dy
+
+        in_bounds = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        clamped_x = np.clip(x, 0, self.width - 1)
+        clamped_y = np.clip(y, 0, self.height - 1)
+        can_move = (self.health[rows, player] > 0) & in_bounds & ~self.solid[clamped_y, clamped_x]
+
+        falls = can_move & self.pit[clamped_y, clamped_x]
+        blockers = self.blockers(rows, x, y, player)
+        blocked = can_move & ~falls & blockers.any(axis=1)
+        moves = can_move & ~blocked
+
+        self.health[rows[falls], player] = 0
+        self.x[rows[moves], player] = x[moves]
+        self.y[rows[moves], player] = y[moves]
+
+        # Whatever's in the way gets attacked or picked up
+        blocker = blockers.argmax(axis=1)
+        blocker_kind = self.kind[blocker]
+        killed = blocked & ((blocker_kind == EntityKind.ENEMY) | (blocker_kind == EntityKind.KEY))
+        self.alive[rows[killed], blocker[killed]] = False
+
+        unlocked = rows[blocked & (blocker_kind == EntityKind.KEY)]
+        if unlocked.size and self.doors.size:
+            doors = np.ix_(unlocked, self.doors)
+            self.open[doors] |= self.alive[doors]
+
+    def step_field(self, root: int) -> np.ndarray:
+        if root not in self.step_fields:
+            self.step_fields[root] = step_field(self.walkable, (root % self.width, root // self.width) if root >= 0 else None).ravel()
+        return self.step_fields[root]
+
+    def enemy_turns(self, rows: np.ndarray):
+        if self.enemies.size == 0:
+            return
+        player = self.player
+        player_x, player_y = self.x[rows, player], self.y[rows, player]
+        # Nothing can path into a pit, so enemies give up and attack from wherever they are
+        roots = np.where(self.walkable[player_y, player_x] != 0, player_y * self.width + player_x, -1)
+
+        x = self.x[rows][:, self.enemies]
+        y = self.y[rows][:, self.enemies]
+        cells = y * self.width + x
+
+        # Rows with the player in the same place share a step field
+        direction = np.empty(cells.shape, dtype=np.int8)
+        for root in np.unique(roots):
+            same_root = roots == root
+            direction[same_root] = self.step_field(int(root))[cells[same_root]]
+        attacks = direction < 0
+
+        acting = self.alive[rows][:, self.enemies]
+        attackers = (attacks & acting).sum(axis=1)
+        self.health[rows, player] = np.maximum(self.health[rows, player] - attackers, 0)
+
+        moving = acting & ~attacks & (self.health[rows][:, self.enemies] > 0)
+        # Enemies move one after another, since each one can block the ones after it
+        for i, enemy in enumerate(self.enemies):
+            movers = np.flatnonzero(moving[:, i])
+            if movers.size == 0:
+                continue
+            target_x = x[movers, i] + NEIGHBOR_DX[direction[movers, i]]
+            target_y = y[movers, i] + NEIGHBOR_DY[direction[movers, i]]
+            free = ~self.blockers(rows[movers], target_x, target_y, enemy).any(axis=1)
+            self.x[rows[movers[free]], enemy] = target_x[free]
+            self.y[rows[movers[free]], enemy] = target_y[free]
@@ -1,123 +1,282 @@
-from dataclasses import dataclass
-import pygame
-import random
-from typing import Optional
-from gameitem import GameItem
-
-random.seed(69)
-
-from tile import *
-from entity import *
-from utils import clamp
-
-from audio import QueuedSound, audio_manager, SoundType
-
-from copy import deepcopy
-
-TILES_PER_ROW = 9
-TILE_WIDTH = 8
-TILE_HEIGHT = 8
-GRID_WIDTH = 32
-GRID_HEIGHT = 18
-
-@dataclass
-class EngineState:
-    entities: dict[UUID, Entity]
-
-class Engine:
-    entities: dict[UUID, Entity]
-    
-    def __init__(self, tilemap: pygame.Surface, width=GRID_WIDTH, height=GRID_HEIGHT) -> None:
-        self.world_width, self.world_height = width, height
-        self.tilemap = tilemap
-
-        self.window = pygame.Surface((GRID_WIDTH * TILE_WIDTH, GRID_HEIGHT * TILE_HEIGHT))
-        self.world = [[EmptyTile(x, y) for x in range(self.world_width)] for y in range(self.world_height)]
-        self.entities = dict()
-        self.player: Optional[Entity] = None
-
-        self.camera_x: float = 0
-        self.camera_y: float = 0
-    
-    def export_state(self) -> EngineState:
-        return EngineState({e.id: deepcopy(e) for e in self.entities.values()})
-    
-    def import_state(self, state: EngineState):
-        for entity in self.entities.values():
-            if not entity.id in state.entities:
-                self.entities[entity.id].marked_for_death = True
-        
-        for i in range(len(self.entities.keys()) - 1, -1, -1):
-            e = list(self.entities.keys())[i]
-            if self.entities[e].marked_for_death:
-                self.entities.pop(e)
-        
-        for entity in state.entities.values():
-            if entity.id in self.entities:
-                curr = self.entities[entity.id]
-                curr.import_state_from(entity)
-                
-                if isinstance(entity, PlayerEntity):
-                    self.player = curr
-            else:
-                self.entities.update({entity.id: deepcopy(entity)})
-
-    def move_player(self, dx: int, dy: int):
-        if self.player == None:
-            return
-        
-        e = self.player.move(self, dx, dy)
-
-        if isinstance(e, EnemyEntity):
-            self.entities.pop(e.id)
-            audio_manager.play_sound(SoundType.HIT)
-        elif isinstance(e, KeyEntity):
-            self.entities.pop(e.id)
-
-            for e in self.entities:
-                entity = self.entities[e]
-                if isinstance(entity, DoorEntity):
-                    entity.open_door()
-
-        for entity in filter(lambda e: isinstance(e, EnemyEntity), self.entities.values()):
-            entity.on_my_turn(self, self.player.x, self.player.y)
-
-    def draw_tile(self, x: float, y: float, tile_index: int):
-        i = tile_index % TILES_PER_ROW
-        j = tile_index // TILES_PER_ROW
-        self.window.blit(self.tilemap.subsurface(i * TILE_WIDTH, j * TILE_HEIGHT, TILE_WIDTH, TILE_HEIGHT), (x * TILE_WIDTH, y * TILE_HEIGHT))
-    
-    def update(self, delta: float):
-        for entity in self.entities.values():
-            entity.update(delta)
-        if self.player is not None:
-            self.camera_x = -GRID_WIDTH // 2 + self.player.show_x
-            self.camera_x = clamp(self.camera_x, 0, self.world_width - GRID_WIDTH)
-            self.camera_y = -GRID_HEIGHT // 2 + self.player.show_y
-            self.camera_y = clamp(self.camera_y, 0, self.world_height - GRID_HEIGHT)
-
-    def key_exists(self) -> bool:
-        return any(isinstance(e, KeyEntity) for e in self.entities.values())
-
-    def all_enemies_dead(self) -> bool:
-        return all(not isinstance(e, EnemyEntity) or e.health <= 0 for e in self.entities.values())
-
-    def draw(self):
-        self.window.fill('black')
-
-        for x in range(self.world_width):
-            for y in range(self.world_height):
-                self.world[y][x].draw(self)
-
-        for i, entity in enumerate(self.entities.values()):
-            tile_idx = entity.tile_id
-            if entity == self.player and entity.health <= 0:
-                tile_idx = 35 # ghost tile
-            self.draw_tile(entity.show_x - self.camera_x, entity.show_y - self.camera_y, tile_idx)
-        
-        # HUD
-        if self.player is not None:
-            for x in range(self.player.health):
-                self.draw_tile(x * 1.5 + 0.5, 0.5, 24)
-            for x in range(self.player.max_health - self.player.health):
-                self.draw_tile((self.player.health + x) * 1.5 + 0.5, 0.5, 25)
\ No newline at end of file
+import numpy as np
+import tcod
+import random
+from typing import TYPE_CHECKING, Optional, cast
+from gameitem import GameItem
+
+random.seed(69)
+
+from tile import *
+from entity import *
+from entity_store import EngineState, EntityKind, EntityStore
+from game_events import DoorOpened, EnemyKilled, EventDispatcher, KeyCollected, LevelCleared
+if TYPE_CHECKING:
+    from systems import TurnSystems
+
+TILES_PER_ROW = 9
+TILE_WIDTH = 8
+TILE_HEIGHT = 8
+GRID_WIDTH = 32
+GRID_HEIGHT = 18
+
+UNREACHABLE = np.iinfo(np.int32).max
+STEP_CACHE_CELLS = 1 << 24
+"How many cells' worth of player step fields we keep around, so revisiting a cell doesn't rerun the search."
+NEIGHBORS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+NEIGHBOR_INDEX = np.full((3, 3), -1, dtype=np.int8)
+"The NEIGHBORS index of each [dy + 1, dx + 1], or -1 for ones that aren't a neighbour."
+for i, (dx, dy) in enumerate(NEIGHBORS):
+    NEIGHBOR_INDEX[dy + 1, dx + 1] = i
+ANIMATION_DECAY = 10
+"How quickly entities slide to where they've moved, for utils.exp_decay."
+
+def step_field(walkable: np.ndarray, root: tuple[int, int] | None) -> np.ndarray:
+    """
+    The NEIGHBORS index of the step each cell takes along a shortest path to root, indexed [y, x], or -1 for cells with
+    no step to take: next to root, or with no way there. It's all one search out from root, so where shortest paths tie,
+    every cell follows whichever way the search reached it first, however big the map is.
+    """
+    steps = np.full(walkable.shape, -1, dtype=np.int8)
+    if root is None:
+        return steps
+    finder = tcod.path.Pathfinder(tcod.path.SimpleGraph(cost=walkable, cardinal=1, diagonal=0))
+    finder.add_root((root[1], root[0]))
+    finder.resolve()
+    stepping = (finder.distance > 1) & (finder.distance != UNREACHABLE)
+    y, x = np.nonzero(stepping)
+    parent = finder.traversal[stepping]
+    steps[stepping] = NEIGHBOR_INDEX[parent[:, 0] - y + 1, parent[:, 1] - x + 1]
+    return steps
+
+class Engine:
+    store: EntityStore
+    "The simulation state of every entity, as columns indexed by entity id."
+    entity_table: list[Entity]
+    "Every entity in the level, alive or not, indexed by id."
+    entities: dict[int, Entity]
+    "The entities still in the world, in id order."
+    by_kind: dict[EntityKind, dict[int, Entity]]
+    "The entities still in the world split up by kind, each in id order, so nothing has to search every entity for one kind."
+    occupants: dict[tuple[int, int], list[Entity]]
+    "The entities standing on each occupied cell, so collisions don't need to search every entity."
+    world: list[list[Tile]]
+    solid: np.ndarray
+    "Whether each cell blocks movement, indexed [y, x] like the rest of the terrain arrays."
+    pit: np.ndarray
+    "Whether each cell is a pit that kills whatever walks into it."
+    walkable: np.ndarray
+    "The pathfinding cost of each cell: 1 for walkable ground, 0 for walls and pits."
+    tile_index: np.ndarray
+    "The tilemap index each cell is drawn with."
+    terrain_version: int
+    "Goes up whenever the terrain changes, so renderers know when what they've cached of it is stale."
+    player_steps: np.ndarray
+    "The step_field towards the player. Computed once per turn and shared by every enemy."
+    step_cache: dict[tuple[int, int] | None, np.ndarray]
+    "Player step fields by player cell, least recently used first. None is the field for when there's no way to the player."
+    events: EventDispatcher
+    "Where the engine announces what happens during turns. Sounds, UI and dialogue subscribe to it instead of polling."
+    cleared: bool | None
+    "Whether every enemy was dead the last time we announced it with a LevelCleared, or None if we haven't yet."
+    systems: "TurnSystems | None"
+    """
+    Runs turns over the store's columns rather than entity by entity, if one's been attached.
+    It's much faster for levels with lots of entities; Puzzle.make_engine(systems=True) attaches one.
+    """
+    
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, events: EventDispatcher | None = None) -> None:
+        """Creates a simulation-only engine; drawing is done by a graphics.engine_renderer.EngineRenderer if there's a display"""
+        self.world_width, self.world_height = width, height
+        self.events = events if events is not None else EventDispatcher()
+        self.cleared = None
+        self.systems = None
+
+        self.step_cache = dict()
+        self.terrain_version = 0
+        self.set_world([[EmptyTile.make() for _ in range(self.world_width)] for _ in range(self.world_height)])
+        self.store = EntityStore()
+        self.entity_table = []
+        self.entities = dict()
+        self.by_kind = {kind: dict() for kind in EntityKind}
+        self.occupants = dict()
+        self.player: Optional[Entity] = None
+        self.player_steps = step_field(self.walkable, None)
+    
+    def set_world(self, world: list[list[Tile]]):
+        """Replaces the terrain, rebuilding the arrays that pathfinding, collision and rendering read"""
+        self.world = world
+        self.solid = np.array([[tile.solid for tile in row] for row in world], dtype=bool)
+        self.pit = np.array([[isinstance(tile, PitTile) for tile in row] for row in world], dtype=bool)
+        self.walkable = (~(self.solid | self.pit)).astype(np.int8)
+        self.tile_index = np.array([[tile.index for tile in row] for row in world], dtype=np.int16)
+        self.step_cache.clear()
+        self.terrain_version += 1
+
+    def set_tile(self, x: int, y: int, tile: Tile):
+        self.world[y][x] = tile
+        self.solid[y, x] = tile.solid
+        self.pit[y, x] = isinstance(tile, PitTile)
+        self.walkable[y, x] = not (self.solid[y, x] or self.pit[y, x])
+        self.tile_index[y, x] = tile.index
+        self.step_cache.clear()
+        self.terrain_version += 1
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.world_width and 0 <= y < self.world_height
+
+    def add_entity(self, entity: Entity):
+        entity.id = self.store.copy_row(entity.store, entity.id)
+        entity.store = self.store
+        self.entity_table.append(entity)
+        self.entities[entity.id] = entity
+        self.by_kind[entity.kind][entity.id] = entity
+        self.occupants.setdefault((entity.x, entity.y), []).append(entity)
+
+    @property
+    def enemies(self) -> dict[int, EnemyEntity]:
+        return cast(dict[int, EnemyEntity], self.by_kind[EntityKind.ENEMY])
+
+    @property
+    def keys(self) -> dict[int, KeyEntity]:
+        return cast(dict[int, KeyEntity], self.by_kind[EntityKind.KEY])
+
+    @property
+    def doors(self) -> dict[int, DoorEntity]:
+        return cast(dict[int, DoorEntity], self.by_kind[EntityKind.DOOR])
+
+    @property
+    def exits(self) -> dict[int, ExitEntity]:
+        return cast(dict[int, ExitEntity], self.by_kind[EntityKind.EXIT])
+
+    def remove_entity(self, entity: Entity):
+        self.entities.pop(entity.id)
+        self.by_kind[entity.kind].pop(entity.id)
+        self.store.set("alive", entity.id, False)
+        self.leave_cell(entity)
+
+    def move_entity(self, entity: Entity, x: int, y: int):
+        self.leave_cell(entity)
+        entity.x, entity.y = x, y
+        self.occupants.setdefault((x, y), []).append(entity)
+
+    def leave_cell(self, entity: Entity):
+        cell = self.occupants[(entity.x, entity.y)]
+        cell.remove(entity)
+        if not cell:
+            self.occupants.pop((entity.x, entity.y))
+
+    def blocking_entity_at(self, x: int, y: int, mover: Entity) -> Optional[Entity]:
+        """Returns the entity that stops mover from stepping onto (x, y), if any"""
+        for entity in self.occupants.get((x, y), ()):
+            if entity is not mover and not (isinstance(entity, DoorEntity) and entity.open):
+                return entity
+        return None
+
+    @property
+    def state_hash(self) -> int:
+        """A 64-bit hash of every entity's position, health, door state and whether it's still around, kept up to date as they change"""
+        return self.store.hash
+
+    def export_state(self) -> EngineState:
+        return self.store.export()
+    
+    def import_state(self, state: EngineState):
+        """Restores a snapshot, only touching the entities that differ from it"""
+        changed = self.store.changed_rows(state)
+        for id in changed:
+            if self.store.alive[id]:
+                entity = self.entity_table[id]
+                self.leave_cell(entity)
+                if not state.alive[id]:
+                    self.entities.pop(id)
+                    self.by_kind[entity.kind].pop(id)
+        
+        self.store.load(state)
+        
+        revived: set[EntityKind] = set()
+        for id in changed:
+            entity = self.entity_table[id]
+            if state.alive[id]:
+                self.occupants.setdefault((entity.x, entity.y), []).append(entity)
+                if id not in self.entities:
+                    self.entities[id] = entity
+                    self.by_kind[entity.kind][id] = entity
+                    revived.add(entity.kind)
+            if isinstance(entity, DoorEntity):
+                entity.update_tile()
+        
+        # Keep entities in id order so turn order doesn't depend on what was restored
+        if revived:
+            self.entities = dict(sorted(self.entities.items()))
+            for kind in revived:
+                self.by_kind[kind] = dict(sorted(self.by_kind[kind].items()))
+        
+        self.update_cleared()
+
+    def move_player(self, dx: int, dy: int):
+        """Runs a turn"""
+        if self.player == None:
+            return
+        if self.systems is not None:
+            self.systems.run_turn(dx, dy)
+            self.update_cleared()
+            return
+        
+        e = self.player.move(self, dx, dy)
+
+        if e is not None and e.kind == EntityKind.ENEMY:
+            self.remove_entity(e)
+            self.events.emit(EnemyKilled(e))
+        elif e is not None and e.kind == EntityKind.KEY:
+            self.remove_entity(e)
+            self.events.emit(KeyCollected(e))
+
+            for door in self.doors.values():
+                if not door.open:
+                    door.open_door()
+                    self.events.emit(DoorOpened(door))
+
+        self.update_player_steps()
+        for entity in self.enemies.values():
+            entity.on_my_turn(self)
+        
+        self.update_cleared()
+
+    def update_cleared(self):
+        """Announces a LevelCleared if whether every enemy is dead has changed since the last one. Does nothing while events are muted."""
+        if self.events.is_muted():
+            return
+        cleared = self.all_enemies_dead()
+        if cleared != self.cleared:
+            self.cleared = cleared
+            self.events.emit(LevelCleared(cleared))
+
+    def update_player_steps(self):
+        # Nothing can path into a pit, so enemies give up and attack from wherever they are
+        root = None
+        if self.player is not None and self.walkable[self.player.y, self.player.x]:
+            root = (self.player.x, self.player.y)
+        
+        if root in self.step_cache:
+            self.player_steps = self.step_cache.pop(root)
+        else:
+            self.player_steps = step_field(self.walkable, root)
+        
+        # Reinserting keeps the dict in least recently used order
+        self.step_cache[root] = self.player_steps
+        while len(self.step_cache) * self.walkable.size > STEP_CACHE_CELLS and len(self.step_cache) > 1:
+            self.step_cache.pop(next(iter(self.step_cache)))
+
+    def step_towards_player(self, x: int, y: int) -> Optional[tuple[int, int]]:
+        """Returns the first step of a shortest path from (x, y) to the player, or None if we're adjacent or there's no path"""
+        step = self.player_steps[y, x]
+        return NEIGHBORS[step] if step >= 0 else None
+
+    def update(self, delta: float):
+        self.store.animate(ANIMATION_DECAY, delta)
+
+    def key_exists(self) -> bool:
+        return len(self.keys) > 0
+
+    def all_enemies_dead(self) -> bool:
+        return all(enemy.health <= 0 for enemy in self.enemies.values())
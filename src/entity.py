@@ -1,132 +1,154 @@
-import numpy as np
-from tcod import path
-import typing
-if typing.TYPE_CHECKING:
-    from engine import Engine
-from tile import *
-from utils import exp_decay
-from uuid import UUID, uuid4
-from audio import audio_manager, SoundType
-
-def lerp(a, b, t): return a + (b - a) * t
-
-class Entity:
-    id: UUID
-    
-    def __init__(self, x: int, y: int, tile_index: int, health: int = 999) -> None:
-        self.id = uuid4()
-        self.x = x
-        self.y = y
-        self.show_x = x
-        self.show_y = y
-        self.tile_id = tile_index
-        self.health = self.max_health = health
-        self.marked_for_death = False
-
-    def on_my_turn(self, engine: "Engine", target_x: int, target_y: int):
-        # i hate this but it gets liveshare to shut the fuck up
-        pass
-
-    def move(self, engine: "Engine", dx: int, dy: int) -> typing.Optional["Entity"]:
-        """returns the entity that gets collided with on move"""
-        
-        if self.health <= 0:
-            return None
-
-        self.x += dx
-        self.y += dy
-        try:
-            if engine.world[self.y][self.x].solid:
-                self.x -= dx
-                self.y -= dy
-            elif isinstance(engine.world[self.y][self.x], PitTile):
-                self.health = 0
-            else:
-                for entity in engine.entities.values():
-                    if entity is not self and entity.x == self.x and entity.y == self.y:
-                        if isinstance(entity, DoorEntity) and entity.open:
-                            continue
-                        self.x -= dx
-                        self.y -= dy
-                        return entity
-        except IndexError:
-            self.x -= dx
-            self.y -= dy
-        return None
-
-    def update(self, delta: float) -> None:
-        self.show_x = exp_decay(self.show_x, self.x, 10, delta)
-        self.show_y = exp_decay(self.show_y, self.y, 10, delta)
-    
-    def import_state_from(self, other: "Entity"):
-        self.x = other.x
-        self.y = other.y
-        self.health = other.health
-
-class PlayerEntity(Entity):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, 17, 3)
-
-class EnemyEntity(Entity):
-    def __init__(self, x: int, y: int, index: int) -> None:
-        super().__init__(x, y, index, 1)
-
-    def on_my_turn(self, engine: "Engine", target_x: int, target_y: int):
-        solids = [[not (engine.world[y][x].solid or isinstance(engine.world[y][x], PitTile)) for x in range(engine.world_width)] for y in range(engine.world_height)]
-
-        solids = np.transpose(solids, (1, 0))
-
-        graph = path.SimpleGraph(cost=solids, cardinal=1, diagonal=0)
-        
-        finder = path.Pathfinder(graph)
-        finder.add_root((self.x, self.y))
-        
-        new_path = finder.path_to((target_x, target_y))
-        new_path = new_path.tolist()[1:-1]
-
-        if len(new_path):
-            dx: int = new_path[0][0] - self.x
-            dy: int = new_path[0][1] - self.y
-
-            self.move(engine, dx, dy)
-        elif engine.player:
-            # ATTACK!
-            player = engine.player
-            if player.health > 0:
-                audio_manager.play_sound(SoundType.HIT, 0.4)
-            player.health = max(player.health - 1, 0)
-            pass
-
-class SnakeEntity(EnemyEntity):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, 8)
-
-class RatEntity(EnemyEntity):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, 6)
-
-class KeyEntity(Entity):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, 26)
-
-class ExitEntity(Entity):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, 35)
-
-class DoorEntity(Entity):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, 22)
-        self.open = False
-
-    def open_door(self):
-        self.open = True
-        self.update_tile()
-    
-    def update_tile(self):
-        self.tile_id = 21 if self.open else 22
-    
-    def import_state_from(self, other: "Entity"):
-        super().import_state_from(other)
-        if isinstance(other, DoorEntity):
-            self.open = other.open
-            self.update_tile()
\ No newline at end of file
+import typing
+from typing import ClassVar
+if typing.TYPE_CHECKING:
+    from engine import Engine
+from game_events import PlayerDamaged
+from entity_store import EntityKind, EntityStore
+
+def lerp(a, b, t): return a + (b - a) * t
+
+class Entity:
+    __slots__ = ("id", "store", "tile_id", "max_health")
+    id: int
+    "The index of this entity's row in its store."
+    store: EntityStore
+    "Where this entity's simulation state lives. Until it's added to an engine, that's a store of its own."
+    kind: ClassVar[EntityKind] = EntityKind.OTHER
+    tile_id: int
+    max_health: int
+    
+    def __init__(self, x: int, y: int, tile_index: int, health: int = 999) -> None:
+        self.store = EntityStore()
+        self.id = self.store.add(self.kind, x, y, health)
+        self.tile_id = tile_index
+        self.max_health = health
+
+    @property
+    def x(self) -> int:
+        return self.store.x[self.id]
+
+    @x.setter
+    def x(self, value: int):
+        self.store.set("x", self.id, value)
+
+    @property
+    def y(self) -> int:
+        return self.store.y[self.id]
+
+    @y.setter
+    def y(self, value: int):
+        self.store.set("y", self.id, value)
+
+    @property
+    def health(self) -> int:
+        return self.store.health[self.id]
+
+    @health.setter
+    def health(self, value: int):
+        self.store.set("health", self.id, value)
+
+    @property
+    def show_x(self) -> float:
+        """Where the entity is drawn, which eases towards x as the engine updates"""
+        return self.store.show_x[self.id]
+
+    @property
+    def show_y(self) -> float:
+        return self.store.show_y[self.id]
+
+    def on_my_turn(self, engine: "Engine"):
+        # i hate this but it gets liveshare to shut the fuck up
+        pass
+
+    def move(self, engine: "Engine", dx: int, dy: int) -> typing.Optional["Entity"]:
+        """returns the entity that gets collided with on move"""
+        
+        if self.health <= 0:
+            return None
+
+        x = self.x + dx
+        y = self.y + dy
+        if not engine.in_bounds(x, y) or engine.solid[y, x]:
+            return None
+        elif engine.pit[y, x]:
+            self.health = 0
+        elif (entity := engine.blocking_entity_at(x, y, self)) is not None:
+            return entity
+        
+        engine.move_entity(self, x, y)
+        return None
+
+class PlayerEntity(Entity):
+    __slots__ = ()
+    kind = EntityKind.PLAYER
+    
+    def __init__(self, x: int, y: int) -> None:
+        super().__init__(x, y, 17, 3)
+
+class EnemyEntity(Entity):
+    __slots__ = ()
+    kind = EntityKind.ENEMY
+    
+    def __init__(self, x: int, y: int, index: int) -> None:
+        super().__init__(x, y, index, 1)
+
+    def on_my_turn(self, engine: "Engine"):
+        step = engine.step_towards_player(self.x, self.y)
+
+        if step is not None:
+            self.move(engine, *step)
+        elif engine.player:
+            # ATTACK!
+            player = engine.player
+            health = player.health
+            player.health = max(health - 1, 0)
+            if player.health < health:
+                engine.events.emit(PlayerDamaged(health - player.health, player.health))
+
+class SnakeEntity(EnemyEntity):
+    __slots__ = ()
+
+    def __init__(self, x: int, y: int) -> None:
+        super().__init__(x, y, 8)
+
+class RatEntity(EnemyEntity):
+    __slots__ = ()
+
+    def __init__(self, x: int, y: int) -> None:
+        super().__init__(x, y, 6)
+
+class KeyEntity(Entity):
+    __slots__ = ()
+    kind = EntityKind.KEY
+    
+    def __init__(self, x: int, y: int) -> None:
+        super().__init__(x, y, 26)
+
+class ExitEntity(Entity):
+    __slots__ = ()
+    kind = EntityKind.EXIT
+    
+    def __init__(self, x: int, y: int) -> None:
+        super().__init__(x, y, 35)
+
+class DoorEntity(Entity):
+    __slots__ = ()
+    kind = EntityKind.DOOR
+    
+    def __init__(self, x: int, y: int) -> None:
+        super().__init__(x, y, 22)
+
+    @property
+    def open(self) -> bool:
+        return bool(self.store.open[self.id])
+
+    @open.setter
+    def open(self, value: bool):
+        self.store.set("open", self.id, value)
+
+    def open_door(self):
+        self.open = True
+        self.update_tile()
+    
+    def update_tile(self):
+        self.tile_id = 21 if self.open else 22
\ No newline at end of file
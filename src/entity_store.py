@@ -0,0 +1,167 @@
+from array import array
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+import math
+import numpy as np
+
+class EntityKind(IntEnum):
+    OTHER = 0
+    PLAYER = 1
+    ENEMY = 2
+    KEY = 3
+    DOOR = 4
+    EXIT = 5
+
+@dataclass
+class EngineState:
+    """A snapshot of every entity in an engine, stored as one column per field indexed by entity id"""
+    kind: array
+    x: array
+    y: array
+    health: array
+    open: array
+    "Whether each door is open. Always 0 for anything that isn't a door."
+    alive: array
+    "Whether each entity is still in the world, as opposed to killed or picked up."
+    hash: int
+    "The store's Zobrist hash at the time of the snapshot."
+
+    @property
+    def nbytes(self) -> int:
+        """How much memory the columns take up, which grows with the number of entities"""
+        return sum(len(column) * column.itemsize for column in (self.kind, self.x, self.y, self.health, self.open, self.alive))
+
+HASHED_COLUMNS = ("x", "y", "health", "open", "alive")
+"Every column that changes during a simulation, and so goes into the hash. Kinds never change."
+MASK_64 = (1 << 64) - 1
+
+@lru_cache(maxsize=1 << 16)
+def zobrist_key(id: int, column: int, value: int) -> int:
+    """A pseudorandom 64-bit key for a row having a value in one of the HASHED_COLUMNS, from splitmix64 instead of a table"""
+    z = ((((id << 3) | column) << 32) + (value & 0xFFFFFFFF) + 0x9E3779B97F4A7C15) & MASK_64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return z ^ (z >> 31)
+
+def zobrist_keys(ids: np.ndarray, column: int, values: np.ndarray) -> np.ndarray:
+    """zobrist_key for many rows at once, relying on uint64 arithmetic wrapping around"""
+    z = (((ids.astype(np.uint64) << np.uint64(3)) | np.uint64(column)) << np.uint64(32))
+    z += (values.astype(np.int64) & 0xFFFFFFFF).astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+class EntityStore:
+    """The simulation state of a set of entities, stored as one column per field indexed by a dense entity id"""
+    kind: array
+    x: array
+    y: array
+    health: array
+    open: array
+    alive: array
+    show_x: array
+    "Where each entity is drawn, easing towards its x. Only for rendering, so it isn't hashed or part of snapshots."
+    show_y: array
+    hash: int
+    """
+    A Zobrist hash of every row: the XOR of a key for each value in the HASHED_COLUMNS.
+    It's kept up to date by set(), so checking whether two states are the same doesn't need to look at every row.
+    """
+
+    def __init__(self) -> None:
+        self.kind = array('b')
+        self.x = array('i')
+        self.y = array('i')
+        self.health = array('i')
+        self.open = array('b')
+        self.alive = array('b')
+        self.show_x = array('d')
+        self.show_y = array('d')
+        self.hash = 0
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def add(self, kind: EntityKind, x: int, y: int, health: int, open: bool = False, alive: bool = True) -> int:
+        """Adds a row, returning its id"""
+        self.kind.append(kind)
+        self.x.append(x)
+        self.y.append(y)
+        self.health.append(health)
+        self.open.append(open)
+        self.alive.append(alive)
+        self.show_x.append(x)
+        self.show_y.append(y)
+        id = len(self.kind) - 1
+        for column, name in enumerate(HASHED_COLUMNS):
+            self.hash ^= zobrist_key(id, column, getattr(self, name)[id])
+        return id
+
+    def set(self, name: str, id: int, value: int):
+        """Sets a row's value in one of the HASHED_COLUMNS, updating the hash"""
+        values: array = getattr(self, name)
+        old = values[id]
+        if old != value:
+            column = HASHED_COLUMNS.index(name)
+            self.hash ^= zobrist_key(id, column, old) ^ zobrist_key(id, column, value)
+            values[id] = value
+
+    def set_many(self, name: str, ids: np.ndarray, values: np.ndarray):
+        """Like set() for many rows at once. Each id should only come up once."""
+        if ids.size == 0:
+            return
+        column = HASHED_COLUMNS.index(name)
+        values_array: array = getattr(self, name)
+        view = np.frombuffer(values_array, dtype=values_array.typecode)
+        changes = zobrist_keys(ids, column, view[ids]) ^ zobrist_keys(ids, column, values)
+        self.hash ^= int(np.bitwise_xor.reduce(changes))
+        view[ids] = values
+
+    def copy_row(self, other: "EntityStore", id: int) -> int:
+        """Adds a copy of another store's row, returning its id in this store"""
+        new_id = self.add(EntityKind(other.kind[id]), other.x[id], other.y[id], other.health[id], bool(other.open[id]), bool(other.alive[id]))
+        self.show_x[new_id] = other.show_x[id]
+        self.show_y[new_id] = other.show_y[id]
+        return new_id
+
+    def export(self) -> EngineState:
+        # Slicing an array copies its buffer in one go
+        return EngineState(self.kind[:], self.x[:], self.y[:], self.health[:], self.open[:], self.alive[:], self.hash)
+
+    def changed_rows(self, state: EngineState) -> list[int]:
+        """Returns the id of every row whose state differs from the snapshot"""
+        changed = np.zeros(len(self), dtype=bool)
+        for column in HASHED_COLUMNS:
+            ours, theirs = getattr(self, column), getattr(state, column)
+            changed |= np.frombuffer(ours, dtype=ours.typecode) != np.frombuffer(theirs, dtype=theirs.typecode)
+        return np.flatnonzero(changed).tolist()
+
+    def load(self, state: EngineState):
+        self.x[:] = state.x
+        self.y[:] = state.y
+        self.health[:] = state.health
+        self.open[:] = state.open
+        self.alive[:] = state.alive
+        self.hash = state.hash
+
+    def animate(self, decay: float, dt: float):
+        """Eases every row's shown position towards its actual one, like utils.exp_decay but for every row in one go"""
+        if len(self) == 0:
+            return
+        factor = math.exp(-decay * dt)
+        for shown, actual in ((self.show_x, self.x), (self.show_y, self.y)):
+            # These are views of the columns, so the arithmetic happens in place
+            shown_view = np.frombuffer(shown, dtype=shown.typecode)
+            actual_view = np.frombuffer(actual, dtype=actual.typecode)
+            shown_view -= actual_view
+            shown_view *= factor
+            shown_view += actual_view
+
+    def compute_hash(self) -> int:
+        """Hashes every row from scratch, which should always give the same as the incrementally kept hash"""
+        hash = 0
+        for id in range(len(self)):
+            for column, name in enumerate(HASHED_COLUMNS):
+                hash ^= zobrist_key(id, column, getattr(self, name)[id])
+        return hash
@@ -1,52 +1,72 @@
-from typing import Optional, TypeVar
-import pygame
-
-from graphics.hoverable import Hoverable
-from graphics.icon_button import IconButton
-
-class Frame:
-    hoverables: set[Hoverable]
-    window: pygame.Surface
-    
-    def __init__(self, bounds: tuple[int, int, int, int]) -> None:
-        self.rect = pygame.Rect(bounds)
-        self.window = pygame.Surface(self.rect.size)
-        self.hoverables = set()
-    
-    def draw(self, surface: pygame.Surface):
-        surface.blit(self.window, (self.rect.x, self.rect.y))
-
-    def resize(self, width, height):
-        self.window = pygame.Surface((width, height))
-        self.rect.size = (width, height)
-    
-    T = TypeVar('T', bound=Hoverable)
-    def add(self, hoverable: T) -> T:
-        self.hoverables.add(hoverable)
-        return hoverable
-
-    def remove(self, hoverable: Hoverable):
-        self.hoverables.discard(hoverable)
-
-    def mouse_over(self):
-        return self.rect.collidepoint(pygame.mouse.get_pos())
-
-    def on_mouse_down(self, mouse: tuple[int, int]):
-        for icon in list(self.hoverables):
-            icon.click(mouse[0], mouse[1])
-    
-    def on_mouse_up(self, mouse: tuple[int, int]):
-        pass
-    
-    def on_mouse_move(self, mouse: tuple[int, int]):
-        """Returns the cursor that should be set, if any"""
-        
-        cursor_set: Optional[pygame.Cursor | int] = None
-        for hoverable in self.hoverables:
-            if (c := hoverable.mouse_move(mouse)) != None and not cursor_set:
-                cursor_set = c
-        
-        return cursor_set
-    
-    def on_scroll(self, y: int):
+from typing import Optional, TypeVar
+import pygame
+
+from graphics.hoverable import Hoverable
+from graphics.icon_button import IconButton
+
+class Frame:
+    hoverables: set[Hoverable]
+    window: pygame.Surface
+    dirty: bool
+    "Whether something redraw_key doesn't cover happened, like the mouse moving, so we have to be redrawn anyway."
+    drawn_key: tuple | None
+    "What redraw_key returned the last time we were drawn."
+    
+    def __init__(self, bounds: tuple[int, int, int, int]) -> None:
+        self.rect = pygame.Rect(bounds)
+        self.window = pygame.Surface(self.rect.size)
+        self.hoverables = set()
+        self.dirty = True
+        self.drawn_key = None
+    
+    def draw(self, surface: pygame.Surface):
+        surface.blit(self.window, (self.rect.x, self.rect.y))
+
+    def redraw_key(self) -> tuple:
+        """Everything besides input that what we draw depends on. While it stays the same (and we aren't dirty), so does our window."""
+        return ()
+
+    def needs_redraw(self) -> bool:
+        """Whether our window would look any different if we drew it now. Assumes we'll be drawn if so."""
+        key = self.redraw_key()
+        if not self.dirty and key == self.drawn_key:
+            return False
+        self.dirty = False
+        self.drawn_key = key
+        return True
+
+    def resize(self, width, height):
+        self.window = pygame.Surface((width, height))
+        self.rect.size = (width, height)
+        self.dirty = True
+    
+    T = TypeVar('T', bound=Hoverable)
+    def add(self, hoverable: T) -> T:
+        self.hoverables.add(hoverable)
+        return hoverable
+
+    def remove(self, hoverable: Hoverable):
+        self.hoverables.discard(hoverable)
+
+    def mouse_over(self):
+        return self.rect.collidepoint(pygame.mouse.get_pos())
+
+    def on_mouse_down(self, mouse: tuple[int, int]):
+        for icon in list(self.hoverables):
+            icon.click(mouse[0], mouse[1])
+    
+    def on_mouse_up(self, mouse: tuple[int, int]):
+        pass
+    
+    def on_mouse_move(self, mouse: tuple[int, int]):
+        """Returns the cursor that should be set, if any"""
+        
+        cursor_set: Optional[pygame.Cursor | int] = None
+        for hoverable in self.hoverables:
+            if (c := hoverable.mouse_move(mouse)) != None and not cursor_set:
+                cursor_set = c
+        
+        return cursor_set
+    
+    def on_scroll(self, y: int):
         pass
\ No newline at end of file
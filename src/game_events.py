@@ -0,0 +1,66 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+import typing
+from typing import Callable, TypeVar
+if typing.TYPE_CHECKING:
+    from entity import DoorEntity, Entity
+
+@dataclass
+class EnemyKilled:
+    enemy: "Entity"
+
+@dataclass
+class KeyCollected:
+    key: "Entity"
+
+@dataclass
+class DoorOpened:
+    door: "DoorEntity"
+
+@dataclass
+class PlayerDamaged:
+    damage: int
+    health: int
+    "The player's health after taking the damage."
+
+@dataclass
+class LevelCleared:
+    cleared: bool
+    "False when the level stops being cleared, like when rewinding to before the last enemy died."
+
+GameEvent = EnemyKilled | KeyCollected | DoorOpened | PlayerDamaged | LevelCleared
+E = TypeVar("E", EnemyKilled, KeyCollected, DoorOpened, PlayerDamaged, LevelCleared)
+
+class EventDispatcher:
+    """Hands the events an engine emits to whoever subscribed to their type, so nothing has to poll the engine for changes"""
+    handlers: dict[type, list[Callable]]
+    mute_depth: int
+    "While above 0, events are dropped instead of dispatched."
+
+    def __init__(self) -> None:
+        self.handlers = dict()
+        self.mute_depth = 0
+
+    def subscribe(self, event_type: type[E], handler: Callable[[E], None]):
+        self.handlers.setdefault(event_type, []).append(handler)
+
+    def unsubscribe(self, event_type: type[E], handler: Callable[[E], None]):
+        self.handlers[event_type].remove(handler)
+
+    def emit(self, event: GameEvent):
+        if self.mute_depth > 0:
+            return
+        for handler in self.handlers.get(type(event), ()):
+            handler(event)
+
+    def is_muted(self) -> bool:
+        return self.mute_depth > 0
+
+    @contextmanager
+    def muted(self):
+        """Drops every event emitted inside the block, for when the engine is just being caught up rather than played"""
+        self.mute_depth += 1
+        try:
+            yield
+        finally:
+            self.mute_depth -= 1
@@ -0,0 +1,117 @@
+import math
+import numpy as np
+import pygame
+from engine import Engine, TILE_WIDTH, TILE_HEIGHT, GRID_WIDTH, GRID_HEIGHT
+from graphics.tile_atlas import TileAtlas
+from utils import clamp
+
+VIEW_MARGIN = 1
+"In tiles. How far past the edges of the view we still draw, so the camera can drift a little before the terrain layer is redrawn."
+
+class EngineRenderer:
+    """Draws an engine's world into a window-sized surface. The engine itself knows nothing about rendering, so it can run headless."""
+    atlas: TileAtlas
+    window: pygame.Surface
+    camera_x: float
+    camera_y: float
+    terrain: pygame.Surface
+    "The terrain around the view, drawn once and then blitted through the camera every frame until the camera leaves it."
+    terrain_source: tuple[Engine, int] | None
+    "The engine and terrain version the terrain layer was drawn from."
+    terrain_x: int
+    "The world tile at the left edge of the terrain layer."
+    terrain_y: int
+    drawn: list[tuple[pygame.Surface, tuple[int, int]]]
+    "Every blit of the last frame we drew, at the pixel it landed on."
+
+    def __init__(self, atlas: TileAtlas) -> None:
+        self.atlas = atlas
+        self.window = pygame.Surface((GRID_WIDTH * TILE_WIDTH, GRID_HEIGHT * TILE_HEIGHT))
+
+        self.camera_x = 0
+        self.camera_y = 0
+        self.terrain = pygame.Surface(((GRID_WIDTH + 2 * VIEW_MARGIN) * TILE_WIDTH, (GRID_HEIGHT + 2 * VIEW_MARGIN) * TILE_HEIGHT))
+        self.terrain_source = None
+        self.terrain_x = 0
+        self.terrain_y = 0
+        self.drawn = []
+
+    def tile_blit(self, x: float, y: float, tile_index: int) -> tuple[pygame.Surface, tuple[float, float]]:
+        """The blit for a tile at (x, y) in tiles, to be drawn along with the rest of a batch by Surface.fblits"""
+        return (self.atlas[tile_index], (x * TILE_WIDTH, y * TILE_HEIGHT))
+
+    def update_terrain(self, engine: Engine) -> bool:
+        """
+        Redraws the terrain layer if the engine or its terrain changed since we last drew it, or the camera moved off it.
+        Only the tiles in view (plus the margin) are ever drawn, so huge worlds cost the same as small ones.
+        Returns whether it was redrawn.
+        """
+        in_layer = (
+            self.terrain_x <= self.camera_x <= self.terrain_x + 2 * VIEW_MARGIN
+            and self.terrain_y <= self.camera_y <= self.terrain_y + 2 * VIEW_MARGIN
+        )
+        if in_layer and self.terrain_source == (engine, engine.terrain_version):
+            return False
+        self.terrain_source = (engine, engine.terrain_version)
+        self.terrain_x = math.floor(self.camera_x) - VIEW_MARGIN
+        self.terrain_y = math.floor(self.camera_y) - VIEW_MARGIN
+
+        self.terrain.fill('black')
+        left, top = max(self.terrain_x, 0), max(self.terrain_y, 0)
+        tiles = engine.tile_index[top:self.terrain_y + GRID_HEIGHT + 2 * VIEW_MARGIN, left:self.terrain_x + GRID_WIDTH + 2 * VIEW_MARGIN]
+        self.terrain.fblits([
+            self.tile_blit(x, y, tile_index)
+            for y, row in enumerate(tiles.tolist(), top - self.terrain_y)
+            for x, tile_index in enumerate(row, left - self.terrain_x)
+        ])
+        return True
+
+    def visible_entities(self, engine: Engine) -> list[int]:
+        """The ids of every entity still in the world that's drawn in view (plus the margin), in id order"""
+        store = engine.store
+        show_x = np.frombuffer(store.show_x, dtype=store.show_x.typecode)
+        show_y = np.frombuffer(store.show_y, dtype=store.show_y.typecode)
+        visible = (
+            (np.frombuffer(store.alive, dtype=store.alive.typecode) != 0)
+            & (show_x > self.camera_x - 1 - VIEW_MARGIN) & (show_x < self.camera_x + GRID_WIDTH + VIEW_MARGIN)
+            & (show_y > self.camera_y - 1 - VIEW_MARGIN) & (show_y < self.camera_y + GRID_HEIGHT + VIEW_MARGIN)
+        )
+        return np.flatnonzero(visible).tolist()
+
+    def update_camera(self, engine: Engine):
+        if engine.player is not None:
+            self.camera_x = -GRID_WIDTH // 2 + engine.player.show_x
+            self.camera_x = clamp(self.camera_x, 0, engine.world_width - GRID_WIDTH)
+            self.camera_y = -GRID_HEIGHT // 2 + engine.player.show_y
+            self.camera_y = clamp(self.camera_y, 0, engine.world_height - GRID_HEIGHT)
+
+    def draw(self, engine: Engine) -> bool:
+        """Draws the engine into the window, returning whether that changed anything since the last frame"""
+        self.update_camera(engine)
+        terrain_changed = self.update_terrain(engine)
+        # Everything goes to the window in one fblits call, in the order it should be layered
+        blits = [(self.terrain, ((self.terrain_x - self.camera_x) * TILE_WIDTH, (self.terrain_y - self.camera_y) * TILE_HEIGHT))]
+
+        show_x, show_y = engine.store.show_x, engine.store.show_y
+        for id in self.visible_entities(engine):
+            entity = engine.entity_table[id]
+            tile_idx = entity.tile_id
+            if entity == engine.player and entity.health <= 0:
+                tile_idx = 35 # ghost tile
+            blits.append(self.tile_blit(show_x[id] - self.camera_x, show_y[id] - self.camera_y, tile_idx))
+
+        # HUD
+        player = engine.player
+        if player is not None:
+            for x in range(player.health):
+                blits.append(self.tile_blit(x * 1.5 + 0.5, 0.5, 24))
+            for x in range(player.max_health - player.health):
+                blits.append(self.tile_blit((player.health + x) * 1.5 + 0.5, 0.5, 25))
+
+        # Blits land on whole pixels, so if they all land where they did last frame, the window would come out the same
+        drawn = [(surface, (int(x), int(y))) for surface, (x, y) in blits]
+        if drawn == self.drawn and not terrain_changed:
+            return False
+        self.drawn = drawn
+        self.window.fblits(drawn)
+        return True
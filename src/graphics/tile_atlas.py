@@ -0,0 +1,19 @@
+from pygame import Surface
+
+from engine import TILES_PER_ROW, TILE_WIDTH, TILE_HEIGHT
+
+class TileAtlas:
+    """The tilemap sliced up once into a surface per tile index, so drawing a tile doesn't make a new subsurface every time"""
+    tiles: list[Surface]
+    "Indexed by tile index, the same numbering as Engine.tile_index and Entity.tile_id."
+
+    def __init__(self, tilemap: Surface):
+        rows = tilemap.height // TILE_HEIGHT
+        # Copies rather than subsurfaces, so blitting one doesn't have to go through the whole tilemap
+        self.tiles = [
+            tilemap.subsurface((index % TILES_PER_ROW) * TILE_WIDTH, (index // TILES_PER_ROW) * TILE_HEIGHT, TILE_WIDTH, TILE_HEIGHT).copy()
+            for index in range(rows * TILES_PER_ROW)
+        ]
+
+    def __getitem__(self, index: int) -> Surface:
+        return self.tiles[index]
@@ -21,9 +21,12 @@ from typing import TYPE_CHECKING, Optional
 
 from dialogue import DialogueManager, DialogueType
 from frame import Frame
+from graphics.asset_loader import loader
+from graphics.engine_renderer import EngineRenderer
 from sequencer.sequencer import Sequencer
 from puzzle import puzzles
-from audio import SoundType, audio_manager
+from audio import audio_manager
+from game_events import EventDispatcher, LevelCleared
 
 MIN_WIDTH = 1280
 MIN_HEIGHT = 720
@@ -34,8 +37,6 @@ else:
     WIN.minimum_size = (MIN_WIDTH, MIN_HEIGHT)
     WIN_SURFACE = WIN.get_surface()
 
-TILEMAP = pygame.image.load("assets/tilemap.png").convert_alpha()
-
 async def main():
     global WIN_SURFACE
     
@@ -57,21 +58,35 @@ async def main():
             print("bye")
             return
         p = puzzles[current_puzzle]
-        engine = p.make_engine(TILEMAP)
+        engine = p.make_engine(game_events)
+        # Nothing's announced until the first turn otherwise, so the next level button would stay up from the last one
+        engine.update_cleared()
         p.update(sequencer, engine.export_state(), input_sequences)
 
+    game_events = EventDispatcher()
     current_puzzle: int = 0
-    engine = puzzles[current_puzzle].make_engine(TILEMAP)
+    engine = puzzles[current_puzzle].make_engine(game_events)
+    engine_renderer = EngineRenderer(loader.get_atlas())
     engine_scale = 3
-    engine_width = engine.window.width * engine_scale
-    engine_height = engine.window.height * engine_scale
+    engine_width = engine_renderer.window.width * engine_scale
+    engine_height = engine_renderer.window.height * engine_scale
     sequencer = Sequencer((0, engine_height, width, height - engine_height), engine_width, engine, advance_puzzle)
     puzzles[current_puzzle].update_sequencer(sequencer)
     input_sequences = puzzles[current_puzzle].make_input_sequences((0, 0, width - engine_width, engine_height))
     dialogue_manager = DialogueManager()
     dialogue_manager.queue_dialogue(DialogueType.INTRO)
-    first_complete: bool = False
-    had_key_last_frame: bool = False
+    
+    def on_level_cleared(event: LevelCleared):
+        sequencer.next_level_icon.shown = event.cleared
+        if event.cleared:
+            sequencer.playing_direction = 0.0
+            sequencer.update_icons()
+    
+    game_events.subscribe(LevelCleared, on_level_cleared)
+    dialogue_manager.listen(game_events)
+    audio_manager.listen(game_events)
+    # Announce the starting state, so the next level button starts hidden
+    engine.update_cleared()
     
     frames: list[Frame] = [sequencer, input_sequences]
 
@@ -79,20 +94,32 @@ async def main():
     pygame.mixer.music.set_volume(0.15)
     pygame.mixer.music.play(-1, fade_ms=500)
     
+    # Only what changed gets redrawn and presented, so an idle screen costs next to nothing.
+    # Some things (resizing, the dialogue or a dragged sequence drawn over the frames changing) need the whole window redrawn
+    full_redraw = True
+    drawn_overlays: tuple | None = None
+    
     def handle_event(event: pygame.Event):
-        nonlocal running, width, height
+        nonlocal running, width, height, full_redraw
         if event.type == pygame.QUIT:
             running = False
             return
         
+        # Hovering, clicking and scrolling can change any frame in ways they can't tell on their own
+        if event.type in [pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL]:
+            for frame in frames:
+                frame.dirty = True
+        elif event.type in [pygame.VIDEORESIZE, pygame.WINDOWEXPOSED]:
+            full_redraw = True
+        
         if dialogue_manager.is_shown() and event.type in [pygame.KEYDOWN, pygame.JOYBUTTONDOWN, pygame.MOUSEBUTTONDOWN]:
             dialogue_manager.on_confirm()
             return
         
         elif event.type == pygame.VIDEORESIZE:
             width, height = event.w, event.h
-            sequencer.resize(width, height - engine.window.height * engine_scale)
-            input_sequences.resize(width - engine.window.width * engine_scale, engine.window.height * engine_scale)
+            sequencer.resize(width, height - engine_renderer.window.height * engine_scale)
+            input_sequences.resize(width - engine_renderer.window.width * engine_scale, engine_renderer.window.height * engine_scale)
         elif event.type == pygame.MOUSEMOTION:
             cursor_set: Optional[pygame.Cursor | int] = None
             mouse = pygame.mouse.get_pos()
@@ -161,43 +188,53 @@ async def main():
         for event in pygame.event.get():
             handle_event(event)
         
-        all_dead = engine.all_enemies_dead()
-        sequencer.next_level_icon.shown = all_dead
-        if all_dead:
-            sequencer.playing_direction = 0.0
-            sequencer.update_icons()
-            if not first_complete:
-                first_complete = True
-                dialogue_manager.queue_dialogue(DialogueType.FINISHED_FIRST_LEVEL)
-        
-        key_exists = engine.key_exists()
-        if not key_exists and had_key_last_frame:
-            audio_manager.play_sound(SoundType.KEY)
-        had_key_last_frame = key_exists
-        
         engine.update(delta)
         
         sequencer.update(engine, delta)
         input_sequences.update(delta)
         dialogue_manager.update(delta)
 
-        WIN_SURFACE.fill('white')
-
-        engine.draw()
-        sequencer.draw(WIN_SURFACE)
-        input_sequences.draw(WIN_SURFACE)
+        # The dialogue and the dragged sequence are drawn over the frames, so while they're changing (or just went away)
+        # there's no telling what's under them without redrawing everything
+        dragging = input_sequences.get_dragged_item() is not None
+        overlays = (dialogue_manager.redraw_key(), dragging)
+        if overlays != drawn_overlays or dragging:
+            full_redraw = True
+        drawn_overlays = overlays
+        if full_redraw:
+            WIN_SURFACE.fill('white')
+            for frame in frames:
+                frame.dirty = True
         
-        WIN_SURFACE.blit(pygame.transform.scale(engine.window, (engine_width, engine_height)), (width - engine_width, 0))
+        dirty_rects: list[pygame.Rect] = []
+        engine_rect = pygame.Rect(width - engine_width, 0, engine_width, engine_height)
+        if engine_renderer.draw(engine) or full_redraw:
+            WIN_SURFACE.blit(pygame.transform.scale(engine_renderer.window, engine_rect.size), engine_rect)
+            dirty_rects.append(engine_rect)
+        for frame in frames:
+            if frame.needs_redraw():
+                frame.draw(WIN_SURFACE)
+                dirty_rects.append(frame.rect)
         
-        dialogue_manager.draw(WIN_SURFACE)
+        if dirty_rects and dialogue_manager.is_shown():
+            dialogue_manager.draw(WIN_SURFACE)
         audio_manager.update()
         
         if is_web() and not TYPE_CHECKING:
             from platform import window
             if int(window.innerWidth) != WIN_SURFACE.width or int(window.innerHeight) != WIN_SURFACE.height:
                 WIN_SURFACE = pygame.display.set_mode((int(window.innerWidth), int(window.innerHeight)), pygame.RESIZABLE)
+                full_redraw = True
+                continue
         
-        WIN.flip()
+        if full_redraw:
+            dirty_rects = [WIN_SURFACE.get_rect()]
+        full_redraw = False
+        if is_web():
+            pygame.display.update(dirty_rects)
+        elif dirty_rects:
+            # Windows can only present their whole surface, but at least we can skip presenting when nothing changed
+            WIN.flip()
     
     pygame.quit()
 
@@ -1,5 +1,7 @@
-TRACK_HEIGHT = 48
-TOP_MARGIN = 32
-MARGIN_LEFT = 48
-PIXELS_PER_BEAT = 50
-SECONDS_PER_BEAT = 0.5
\ No newline at end of file
+TRACK_HEIGHT = 48
+TOP_MARGIN = 32
+MARGIN_LEFT = 48
+PIXELS_PER_BEAT = 50
+SECONDS_PER_BEAT = 0.5
+MAX_LENGTH = int(60 / SECONDS_PER_BEAT)
+"In beats. How long the timeline is."
\ No newline at end of file
@@ -1,59 +1,149 @@
-from audio import QueuedSound
-from engine import Engine, EngineState
-from input_sequences.event import Input
-from sequencer.track import Track
-
-
-class EnginePlaybackManager:
-    starting_state: EngineState
-    
-    def __init__(self, starting_state: EngineState):
-        self.starting_state = starting_state
-    
-    def reset(self, starting_state: EngineState):
-        self.starting_state = starting_state
-    
-    def recompute(self, beat: int, engine: Engine, tracks: list[Track]):
-        engine.import_state(self.starting_state)
-        if beat >= 1:
-            for i in range(0, beat + 1):
-                self.process(i, engine, tracks)
-    
-    def process(self, beat: int, engine: Engine, tracks: list[Track]):
-        inputs = self.get_inputs_at_beat(beat, tracks)
-        
-        x_input = 0
-        y_input = 0
-        
-        for input in inputs:
-            match input:
-                case Input.Up: y_input -= 1
-                case Input.Down: y_input += 1
-                case Input.Left: x_input -= 1
-                case Input.Right: x_input += 1
-                # todo others idk
-        
-        if x_input != 0 or y_input != 0:
-            engine.move_player(x_input, y_input)
-        elif Input.Wait in inputs:
-            engine.move_player(0, 0)
-            return
-    
-    def get_inputs_at_beat(self, beat: int, tracks: list[Track]) -> set[Input]:
-        inputs = set()
-        
-        for track in tracks:
-            track_beat: int = ((beat - 1) % track.repeat_length) + 1
-            
-            # Find the event with a time and duration that includes the current beat
-            event = None
-            for e in track.events:
-                if e.time < track_beat <= e.time + e.duration:
-                    event = e
-                    break
-            if event is not None:
-                input = event.inputs[track_beat - event.time - 1]
-                if input != Input.Empty:
-                    inputs.add(input)
-    
-        return inputs
\ No newline at end of file
+from engine import Engine, EngineState
+from input_sequences.event import Input
+from sequencer.timeline import CompiledTimeline, TrackInputs
+
+CHECKPOINT_INTERVAL = 4
+"In beats. Seeking replays at most this many beats past the nearest checkpoint."
+MAX_CHECKPOINT_BYTES = 4 << 20
+"How much memory the snapshots can take up before we evict the least recently used ones. Snapshots grow with the number of entities."
+
+class EnginePlaybackManager:
+    starting_state: EngineState
+    timeline: CompiledTimeline
+    checkpoints: dict[int, EngineState]
+    "The engine state after processing every beat up to and including the key, in least to most recently used order."
+    checkpoint_bytes: int
+    "The total EngineState.nbytes of every checkpoint."
+    checkpoint_interval: int
+    max_checkpoint_bytes: int
+    
+    live_engine: Engine | None
+    "The engine we last moved, if its state is still valid."
+    processed_beat: int
+    "The last beat processed on live_engine, or -1 if it's still at the starting state."
+    
+    period_states: dict[int, int]
+    """
+    The state hash after each beat we've processed that ends a period of the timeline, and the earliest beat it was seen on.
+    The same inputs follow every period boundary, so seeing a state again on one means the game loops from there on.
+    """
+    
+    def __init__(self, starting_state: EngineState, checkpoint_interval: int = CHECKPOINT_INTERVAL, max_checkpoint_bytes: int = MAX_CHECKPOINT_BYTES):
+        self.starting_state = starting_state
+        self.timeline = CompiledTimeline([])
+        self.checkpoints = dict()
+        self.checkpoint_bytes = 0
+        self.checkpoint_interval = checkpoint_interval
+        self.max_checkpoint_bytes = max_checkpoint_bytes
+        self.live_engine = None
+        self.processed_beat = -1
+        self.period_states = dict()
+    
+    def reset(self, starting_state: EngineState):
+        self.starting_state = starting_state
+        self.checkpoints.clear()
+        self.checkpoint_bytes = 0
+        self.live_engine = None
+        self.period_states.clear()
+    
+    def set_tracks(self, tracks: list[TrackInputs]):
+        self.timeline.set_tracks(tracks)
+        self.invalidate()
+    
+    def update_track(self, index: int):
+        """Recompiles the inputs of a track after its events changed. The caller is responsible for invalidating the affected beats."""
+        self.timeline.update_track(index)
+    
+    def invalidate(self, from_beat: int = 0):
+        """Drops every checkpoint that depends on the inputs at or after from_beat"""
+        for beat in [b for b in self.checkpoints if b >= from_beat]:
+            self.drop_checkpoint(beat)
+        for hash in [h for h, b in self.period_states.items() if b >= from_beat]:
+            self.period_states.pop(hash)
+        if self.processed_beat >= from_beat:
+            self.live_engine = None
+    
+    def seek(self, beat: int, engine: Engine):
+        """
+        Moves the engine to the given beat, stepping the live state forward in place when we can and restoring a snapshot otherwise.
+        The engine's events are only emitted for the beats we step forward over.
+        """
+        target = beat if beat >= 1 else -1
+        if self.live_engine is not engine or self.processed_beat > target:
+            self.recompute(beat, engine)
+            return
+        
+        # Jumping to a checkpoint skips the events of the beats in between, so only do it when it saves real work,
+        # rather than every few beats while playing back over ground we've already covered
+        checkpoint = self.nearest_checkpoint(target)
+        if checkpoint is not None and checkpoint - self.processed_beat > self.checkpoint_interval:
+            self.restore(checkpoint, engine)
+        self.advance(target, engine)
+    
+    def recompute(self, beat: int, engine: Engine):
+        """Restores the engine to the given beat from the nearest snapshot"""
+        target = beat if beat >= 1 else -1
+        # Nothing new happens when going backwards, so there's nothing to announce except where we ended up
+        with engine.events.muted():
+            self.restore(self.nearest_checkpoint(target), engine)
+            self.advance(target, engine)
+        engine.update_cleared()
+    
+    def restore(self, checkpoint: int | None, engine: Engine):
+        """Imports the given checkpoint, or the starting state if it's None, into the engine"""
+        self.live_engine = engine
+        if checkpoint is None:
+            engine.import_state(self.starting_state)
+            self.processed_beat = -1
+        else:
+            engine.import_state(self.checkpoints[checkpoint])
+            self.processed_beat = checkpoint
+    
+    def advance(self, beat: int, engine: Engine):
+        """
+        Processes every beat after the last processed one up to and including beat on the live engine.
+        Once the game is known to loop, whole loops are skipped without processing them (or emitting their events).
+        """
+        i = self.processed_beat + 1
+        while i <= beat:
+            self.process(i, engine)
+            if i % self.checkpoint_interval == 0 and i not in self.checkpoints:
+                self.store_checkpoint(i, engine)
+            if (i + 1) % self.timeline.period == 0:
+                i += self.skip_cycles(i, beat, engine)
+            i += 1
+        self.processed_beat = max(self.processed_beat, beat)
+    
+    def skip_cycles(self, processed_beat: int, beat: int, engine: Engine) -> int:
+        """Called after processing a beat that ends a period. Returns how many beats we can skip, since the engine will be in the same state after them."""
+        first_seen = self.period_states.setdefault(engine.state_hash, processed_beat)
+        if first_seen == processed_beat:
+            return 0
+        
+        length = processed_beat - first_seen
+        return (beat - processed_beat) // length * length
+    
+    def nearest_checkpoint(self, beat: int) -> int | None:
+        """Returns the latest checkpointed beat at or before beat, if any, and marks it as recently used"""
+        nearest = max((b for b in self.checkpoints if b <= beat), default=None)
+        if nearest is not None:
+            self.checkpoints[nearest] = self.checkpoints.pop(nearest)
+        return nearest
+    
+    def store_checkpoint(self, beat: int, engine: Engine):
+        self.checkpoints[beat] = engine.export_state()
+        self.checkpoint_bytes += self.checkpoints[beat].nbytes
+        while self.checkpoint_bytes > self.max_checkpoint_bytes:
+            # Dicts keep insertion order, so the first key is the least recently used
+            self.drop_checkpoint(next(iter(self.checkpoints)))
+    
+    def drop_checkpoint(self, beat: int):
+        self.checkpoint_bytes -= self.checkpoints.pop(beat).nbytes
+    
+    def process(self, beat: int, engine: Engine):
+        move = self.timeline.move_at(beat)
+        if move is not None:
+            engine.move_player(*move)
+    
+    def get_inputs_at_beat(self, beat: int) -> frozenset[Input]:
+        return self.timeline.inputs_at(beat)
\ No newline at end of file
@@ -0,0 +1,111 @@
+import math
+from collections import Counter
+from typing import Protocol
+from input_sequences.event import Event, Input
+
+Move = tuple[int, int]
+
+class TrackInputs(Protocol):
+    """The parts of a track the timeline reads, so tracks without any UI (like the solver's) can be played too"""
+    repeat_length: int
+    events: list[Event]
+
+def resolve_move(inputs: frozenset[Input]) -> Move | None:
+    """The player move that a set of simultaneous inputs makes, if any"""
+    x_input = 0
+    y_input = 0
+
+    for input in inputs:
+        match input:
+            case Input.Up: y_input -= 1
+            case Input.Down: y_input += 1
+            case Input.Left: x_input -= 1
+            case Input.Right: x_input += 1
+            # todo others idk
+
+    if x_input != 0 or y_input != 0:
+        return (x_input, y_input)
+    elif Input.Wait in inputs:
+        return (0, 0)
+    return None
+
+class CompiledTimeline:
+    """The inputs of every track flattened into one table per beat, so replaying a beat is a single lookup"""
+    tracks: list[TrackInputs]
+    track_inputs: list[list[Input]]
+    "The input on every beat of each track, starting from track beat 1."
+    period: int
+    "In beats. The LCM of every track's repeat length, after which the combined inputs repeat."
+    counts: list[Counter[Input]]
+    "How many tracks give each (non-empty) input on each beat modulo the period, so one track's inputs can be taken back out."
+    inputs: list[frozenset[Input]]
+    "The combined inputs for each beat modulo the period."
+    moves: list[Move | None]
+    "The player move for each beat modulo the period."
+
+    def __init__(self, tracks: list[TrackInputs]):
+        self.set_tracks(tracks)
+
+    def set_tracks(self, tracks: list[TrackInputs]):
+        self.tracks = tracks
+        self.track_inputs = [self.compile_track(track) for track in tracks]
+        self.period = math.lcm(*(track.repeat_length for track in tracks))
+        self.combine()
+
+    def update_track(self, index: int):
+        """Recompiles a single track after its events changed, only touching the beats where its inputs did"""
+        old_inputs = self.track_inputs[index]
+        new_inputs = self.compile_track(self.tracks[index])
+        self.track_inputs[index] = new_inputs
+        if len(new_inputs) != len(old_inputs):
+            # The track's length changed, so every beat it lines up with (and maybe the period) did too
+            self.period = math.lcm(*(track.repeat_length for track in self.tracks))
+            self.combine()
+            return
+
+        length = len(new_inputs)
+        for i, (old, new) in enumerate(zip(old_inputs, new_inputs)):
+            if old == new:
+                continue
+            # Track beat i + 1 is read on every beat b with (b - 1) % length == i
+            for beat in range((i + 1) % length, self.period, length):
+                counts = self.counts[beat]
+                if old != Input.Empty:
+                    counts[old] -= 1
+                    if counts[old] == 0:
+                        del counts[old]
+                if new != Input.Empty:
+                    counts[new] += 1
+                self.inputs[beat] = frozenset(counts)
+                self.moves[beat] = resolve_move(self.inputs[beat])
+
+    @staticmethod
+    def compile_track(track: TrackInputs) -> list[Input]:
+        inputs = [Input.Empty] * track.repeat_length
+        # Go backwards so the first event covering a beat wins, like the old per-beat search did
+        for event in reversed(track.events):
+            for i, input in enumerate(event.inputs[:track.repeat_length - event.time]):
+                inputs[event.time + i] = input
+        return inputs
+
+    def combine(self):
+        # Beat b reads track beat ((b - 1) % length) + 1, so rotate each track by one and repeat it over the period
+        columns = [
+            (inputs[-1:] + inputs[:-1]) * (self.period // track.repeat_length)
+            for track, inputs in zip(self.tracks, self.track_inputs)
+        ]
+        if columns:
+            self.counts = [Counter(input for input in beat if input != Input.Empty) for beat in zip(*columns)]
+        else:
+            self.counts = [Counter()]
+        self.inputs = [frozenset(counts) for counts in self.counts]
+
+        # Only a handful of different input combinations ever come up, so resolve each once
+        moves = {inputs: resolve_move(inputs) for inputs in set(self.inputs)}
+        self.moves = [moves[inputs] for inputs in self.inputs]
+
+    def inputs_at(self, beat: int) -> frozenset[Input]:
+        return self.inputs[beat % self.period]
+
+    def move_at(self, beat: int) -> Move | None:
+        return self.moves[beat % self.period]
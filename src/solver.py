@@ -0,0 +1,441 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field, fields
+import math
+import multiprocessing
+import os
+import sys
+import time
+from typing import Callable, Iterator
+import numpy as np
+from engine import Engine, EngineState
+from input_sequences.event import Event, EventId, Input
+from puzzle import Puzzle, puzzles
+from sequencer.constants import MAX_LENGTH
+from sequencer.engine_playback_manager import EnginePlaybackManager
+from sequencer.timeline import CompiledTimeline, Move, resolve_move
+
+@dataclass(frozen=True)
+class Placement:
+    """One of the puzzle's input sequences dropped onto a track"""
+    sequence: int
+    "The index of the sequence in the puzzle's input_sequences."
+    track: int
+    time: int
+    "In beats, from the start of the track."
+
+@dataclass
+class TrackLayout:
+    """A track without any of the UI, which is all the timeline needs to play it"""
+    repeat_length: int
+    events: list[Event]
+
+@dataclass
+class Solution:
+    placements: list[Placement]
+    cleared_beat: int
+    "The first beat on which every enemy is dead."
+
+@dataclass
+class SearchStats:
+    layouts: int = 0
+    "How many valid ways of placing the sequences there are."
+    duplicates: int = 0
+    "Layouts skipped because another one plays exactly the same moves."
+    simulated: int = 0
+    beats: int = 0
+    "How many beats we actually ran on the engine."
+    cached: int = 0
+    "How many beats were skipped because we'd already seen what that move does from that state."
+    deaths: int = 0
+    cycles: int = 0
+    "Layouts dropped because the game got back into a state it had already been in at the same point of the timeline."
+    bounded: int = 0
+    "Layouts dropped because they couldn't beat the best solution so far."
+    timeouts: int = 0
+    "Layouts that were still going at max_length."
+    seconds: float = 0.0
+
+    def add(self, other: "SearchStats"):
+        for stat in fields(self):
+            setattr(self, stat.name, getattr(self, stat.name) + getattr(other, stat.name))
+
+@dataclass
+class SolveResult:
+    best: Solution | None
+    solutions: list[Solution] = field(default_factory=list)
+    "Every solution found, in the order they were found. When bounding, each is better than the ones before it."
+    stats: SearchStats = field(default_factory=SearchStats)
+    cancelled: bool = False
+    "Whether the search was stopped before it went through every layout."
+
+    def merge(self, other: "SolveResult"):
+        """Adds the results of searching another shard"""
+        self.solutions += other.solutions
+        if other.best is not None and (self.best is None or solution_rank(other.best) < solution_rank(self.best)):
+            self.best = other.best
+        self.stats.add(other.stats)
+        self.cancelled |= other.cancelled
+
+Outcome = tuple[str, int]
+"What happened to a layout, and on which beat."
+Step = tuple[str | None, EngineState, int]
+"What a move does from some state: whether the level ended (and how), and the state and hash it leads to."
+
+class Solver:
+    """
+    Finds the placements of a puzzle's input sequences that kill every enemy soonest.
+    Every valid layout is enumerated, layouts that play the same moves are merged, and the rest are simulated
+    in an order that lets layouts sharing a prefix of moves share the beats they have in common.
+    A transposition table keyed by the engine's state hash means each move is only ever run once from any given state.
+    """
+    puzzle: Puzzle
+    max_length: int
+    "In beats. Layouts that haven't cleared the level by this beat don't count."
+    engine: Engine
+    engine_hash: int
+    "The hash of the state the engine is currently in."
+    starting_state: EngineState
+    transitions: dict[tuple[int, int], Step]
+    "A transposition table of what each move code does from each state hash we've seen."
+    track_masks: dict[tuple[int, tuple[Placement, ...]], np.ndarray]
+    "The inputs on every beat of a track with the given placements, as bitmasks of INPUT_BITS."
+    move_codes: np.ndarray
+    "The index into MOVES of the move each bitmask of inputs makes."
+
+    def __init__(self, puzzle: Puzzle, max_length: int = MAX_LENGTH):
+        self.puzzle = puzzle
+        self.max_length = max_length
+        self.engine = puzzle.make_engine()
+        self.starting_state = self.engine.export_state()
+        self.engine_hash = self.engine.state_hash
+        self.transitions = dict()
+        self.track_masks = dict()
+
+        # What move every combination of inputs makes, as decided by the timeline
+        self.move_codes = np.zeros(1 << len(Input), dtype=np.uint8)
+        for mask in range(len(self.move_codes)):
+            inputs = frozenset(input for input, bit in INPUT_BITS.items() if mask & bit)
+            self.move_codes[mask] = MOVES.index(resolve_move(inputs))
+
+    def layouts(self, prefix: tuple[int, ...] = ()) -> Iterator[list[Placement]]:
+        """Yields every valid way to place any subset of the sequences, each as a list of placements, starting with the given shard prefix"""
+        for _, placements in self.walk(prefix, len(self.puzzle.input_sequences)):
+            yield placements
+
+    def shards(self, depth: int) -> list[tuple[int, ...]]:
+        """Splits the layouts by what the first depth sequences do. Each shard is a prefix for layouts()."""
+        return [choices for choices, _ in self.walk((), min(depth, len(self.puzzle.input_sequences)))]
+
+    def walk(self, prefix: tuple[int, ...], depth: int) -> Iterator[tuple[tuple[int, ...], list[Placement]]]:
+        """Yields the option chosen for each of the first depth sequences and the resulting placements, for every valid choice starting with prefix"""
+        sequences = self.puzzle.input_sequences
+        lengths = self.puzzle.track_lengths
+
+        # Every (track, time) a sequence could go at, plus None for leaving it out
+        options: list[list[tuple[int, int] | None]] = []
+        for inputs in sequences:
+            options.append([
+                (track, time)
+                for track, length in enumerate(lengths)
+                # Like the sequencer, something too long for a track gets clamped to its start
+                for time in range(max(0, length - len(inputs)) + 1)
+            ] + [None])
+
+        occupied: list[list[tuple[int, int]]] = [[] for _ in lengths]
+        choices: list[int] = []
+        chosen: list[Placement] = []
+
+        def place(i: int, first_option: int):
+            if i == depth:
+                yield tuple(choices), list(chosen)
+                return
+
+            duration = len(sequences[i])
+            indices = range(first_option, len(options[i]))
+            if i < len(prefix):
+                indices = [prefix[i]] if prefix[i] in indices else []
+
+            for index in indices:
+                option = options[i][index]
+                # Swapping two identical sequences gives the same layout, so only take them in one order
+                next_first = index if i + 1 < len(sequences) and sequences[i + 1] == sequences[i] else 0
+
+                if option is not None:
+                    track, start = option
+                    if any(start < other + other_duration and other < start + duration for other, other_duration in occupied[track]):
+                        continue
+                    occupied[track].append((start, duration))
+                    chosen.append(Placement(i, track, start))
+
+                choices.append(index)
+                yield from place(i + 1, next_first)
+                choices.pop()
+
+                if option is not None:
+                    chosen.pop()
+                    occupied[option[0]].pop()
+
+        yield from place(0, 0)
+
+    def tracks(self, placements: list[Placement]) -> list[TrackLayout]:
+        tracks = [TrackLayout(length, []) for length in self.puzzle.track_lengths]
+        for placement in sorted(placements, key=lambda p: p.time):
+            inputs = self.puzzle.input_sequences[placement.sequence]
+            tracks[placement.track].events.append(Event(EventId(placement.sequence), list(inputs), placement.time, len(inputs)))
+        return tracks
+
+    def moves(self, placements: list[Placement]) -> bytes:
+        """The move code played on every beat up to max_length, which is all that matters about a layout"""
+        # Compiling a whole timeline per layout is slow, so each track's inputs are compiled once into bitmasks and OR'd together
+        combined = np.zeros(self.max_length + 1, dtype=np.uint16)
+        for track, layout in enumerate(self.tracks(placements)):
+            key = (track, tuple(p for p in placements if p.track == track))
+            if key not in self.track_masks:
+                inputs = CompiledTimeline.compile_track(layout)
+                masks = np.array([INPUT_BITS[input] for input in inputs], dtype=np.uint16)
+                # Beat b reads track beat ((b - 1) % length) + 1, like the timeline
+                self.track_masks[key] = masks[(np.arange(self.max_length + 1) - 1) % layout.repeat_length]
+            combined |= self.track_masks[key]
+        return self.move_codes[combined].tobytes()
+
+    def solve(self, bound: bool = True, prefix: tuple[int, ...] = (), best: Solution | None = None, stop: Callable[[], bool] | None = None) -> SolveResult:
+        """
+        Searches every layout in the shard with the given prefix. With bound set, layouts are dropped as soon as they can't clear
+        the level sooner (or as soon with fewer events) than the best so far, starting from best if it's given (it's returned
+        as the best if nothing beats it); otherwise every layout that clears the level is returned.
+        stop is polled between layouts, and the search gives up early once it returns True.
+        """
+        started = time.perf_counter()
+        result = SolveResult(best)
+        stats = result.stats
+        period = math.lcm(*self.puzzle.track_lengths)
+
+        # Layouts that play the same moves on every beat are the same as far as the game is concerned
+        unique: dict[bytes, list[Placement]] = dict()
+        for placements in self.layouts(prefix):
+            stats.layouts += 1
+            moves = self.moves(placements)
+            if moves in unique:
+                stats.duplicates += 1
+                if len(placements) >= len(unique[moves]):
+                    continue
+            unique[moves] = placements
+
+        # path[k] is the state before processing beat k of the moves we last simulated, with its hash
+        path: list[tuple[EngineState, int]] = [(self.starting_state, self.starting_state.hash)]
+        last_moves = b""
+        last_outcome: Outcome | None = None
+
+        for moves in sorted(unique):
+            if stop is not None and stop():
+                result.cancelled = True
+                break
+
+            placements = unique[moves]
+            stats.simulated += 1
+
+            shared = 0
+            for a, b in zip(moves, last_moves):
+                if a != b:
+                    break
+                shared += 1
+
+            outcome = None
+            if last_outcome is not None and last_outcome[0] in ("cleared", "died") and shared > last_outcome[1]:
+                # The last layout ended on a beat before these moves diverged, so this one ends the same way
+                outcome = last_outcome
+            else:
+                del path[min(shared, len(path) - 1) + 1:]
+                outcome = self.simulate(moves, period, len(placements), path, result.best if bound else None, stats)
+
+            match outcome[0]:
+                case "cleared":
+                    if result.best is not None and bound and (outcome[1], len(placements)) >= solution_rank(result.best):
+                        stats.bounded += 1
+                    else:
+                        solution = Solution(placements, outcome[1])
+                        result.solutions.append(solution)
+                        if result.best is None or solution_rank(solution) < solution_rank(result.best):
+                            result.best = solution
+                case "died": stats.deaths += 1
+                case "cycle": stats.cycles += 1
+                case "bounded": stats.bounded += 1
+                case "timeout": stats.timeouts += 1
+
+            last_moves = moves
+            last_outcome = outcome
+
+        stats.seconds = time.perf_counter() - started
+        return result
+
+    def simulate(self, moves: bytes, period: int, events: int, path: list[tuple[EngineState, int]], best: Solution | None, stats: SearchStats) -> Outcome:
+        """Plays the moves from the end of the path, extending the path as it goes, giving up once it can't beat best"""
+        state, hash = path[-1]
+
+        # Only states on the same beat of the timeline's period have the same moves ahead of them
+        seen = {hash for beat, (_, hash) in enumerate(path) if beat % period == 0}
+
+        for beat in range(len(path) - 1, len(moves)):
+            if best is not None and (beat, events) >= solution_rank(best):
+                return ("bounded", beat)
+
+            step = self.transitions.get((hash, moves[beat]))
+            if step is None:
+                step = self.transitions[(hash, moves[beat])] = self.step(state, hash, moves[beat])
+                stats.beats += 1
+            else:
+                stats.cached += 1
+
+            ending, state, hash = step
+            if ending is not None:
+                return (ending, beat)
+
+            path.append((state, hash))
+            if (beat + 1) % period == 0:
+                if hash in seen:
+                    return ("cycle", beat)
+                seen.add(hash)
+
+        return ("timeout", len(moves))
+
+    def step(self, state: EngineState, hash: int, code: int) -> Step:
+        """Runs a single move on the engine from the given state"""
+        engine = self.engine
+        if self.engine_hash != hash:
+            engine.import_state(state)
+
+        move = MOVES[code]
+        if move is not None:
+            engine.move_player(*move)
+
+        next_state = engine.export_state()
+        self.engine_hash = engine.state_hash
+
+        ending = None
+        if engine.player is None or engine.player.health <= 0:
+            ending = "died"
+        elif engine.all_enemies_dead():
+            ending = "cleared"
+        return (ending, next_state, self.engine_hash)
+
+    def check(self, solution: Solution) -> bool:
+        """Replays a solution through the playback manager like the game would, to make sure it really clears the level"""
+        engine = self.puzzle.make_engine()
+        playback_manager = EnginePlaybackManager(engine.export_state())
+        playback_manager.set_tracks(self.tracks(solution.placements))
+        playback_manager.seek(solution.cleared_beat, engine)
+        return engine.all_enemies_dead()
+
+def solution_rank(solution: Solution) -> tuple[int, int]:
+    """Solutions that clear the level sooner are better, then ones with fewer events"""
+    return (solution.cleared_beat, len(solution.placements))
+
+worker_solver: Solver | None = None
+"The solver each process in a ParallelSolver's pool searches its shards with."
+worker_stop: Callable[[], bool] | None = None
+
+def start_worker(puzzle: Puzzle, max_length: int, stop_event):
+    global worker_solver, worker_stop
+    worker_solver = Solver(puzzle, max_length)
+    worker_stop = stop_event.is_set
+
+def solve_shard(prefix: tuple[int, ...], bound: bool, best: Solution | None) -> SolveResult:
+    assert worker_solver is not None
+    return worker_solver.solve(bound, prefix, best, worker_stop)
+
+SHARDS_PER_WORKER = 8
+"How many shards we try to split the layouts into per worker, so workers that finish early have something left to pick up."
+
+class ParallelSolver:
+    """
+    Splits the layouts of a puzzle into shards by the first few placement decisions and searches them in a pool of processes,
+    each with its own headless engine. Workers pick up the next shard as soon as they finish one, along with the best solution
+    so far to bound against.
+    """
+    puzzle: Puzzle
+    max_length: int
+    workers: int
+    shard_depth: int | None
+    "How many placement decisions each shard fixes, or None to pick it from the number of workers."
+
+    def __init__(self, puzzle: Puzzle, workers: int | None = None, shard_depth: int | None = None, max_length: int = MAX_LENGTH):
+        self.puzzle = puzzle
+        self.max_length = max_length
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_depth = shard_depth
+
+    def shards(self) -> list[tuple[int, ...]]:
+        solver = Solver(self.puzzle, self.max_length)
+        if self.shard_depth is not None:
+            return solver.shards(self.shard_depth)
+
+        shards = solver.shards(0)
+        for depth in range(1, len(self.puzzle.input_sequences) + 1):
+            if len(shards) >= self.workers * SHARDS_PER_WORKER:
+                break
+            shards = solver.shards(depth)
+        return shards
+
+    def solve(self, bound: bool = True, stop_at_first: bool = False) -> SolveResult:
+        """Searches every shard like Solver.solve. With stop_at_first set, every worker is stopped as soon as any solution turns up."""
+        started = time.perf_counter()
+        result = SolveResult(None)
+        shards = iter(self.shards())
+
+        context = multiprocessing.get_context()
+        stop_event = context.Event()
+        with ProcessPoolExecutor(self.workers, mp_context=context, initializer=start_worker, initargs=(self.puzzle, self.max_length, stop_event)) as pool:
+            pending: set[Future[SolveResult]] = set()
+
+            def submit(count: int):
+                for _, prefix in zip(range(count), shards):
+                    pending.add(pool.submit(solve_shard, prefix, bound, result.best if bound else None))
+
+            # Keep a couple of shards queued per worker so none of them sit idle waiting for us
+            submit(self.workers * 2)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result.merge(future.result())
+
+                if stop_at_first and result.best is not None:
+                    stop_event.set()
+                    for future in pending:
+                        future.cancel()
+                    result.cancelled = True
+                    # Whatever's still running stops at its next layout, and might have found something by then
+                    for future in wait(pending).done:
+                        if not future.cancelled():
+                            result.merge(future.result())
+                    break
+
+                submit(len(done))
+
+        result.stats.seconds = time.perf_counter() - started
+        return result
+
+MOVES: list[Move | None] = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)] + [None]
+INPUT_BITS = {input: 0 if input == Input.Empty else 1 << i for i, input in enumerate(Input)}
+
+def format_solution(puzzle: Puzzle, solution: Solution) -> str:
+    track_names = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    placements = ", ".join(
+        f"{'+'.join(input.value for input in puzzle.input_sequences[p.sequence])} on {track_names[p.track]}@{p.time}"
+        for p in sorted(solution.placements, key=lambda p: (p.track, p.time))
+    )
+    return f"beat {solution.cleared_beat}: {placements}"
+
+if __name__ == "__main__":
+    # python solver.py [workers]
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    for puzzle in puzzles:
+        solver = Solver(puzzle)
+        result = solver.solve() if workers == 1 else ParallelSolver(puzzle, workers).solve()
+        stats = result.stats
+        print(f"{puzzle.name}: " + (format_solution(puzzle, result.best) if result.best else "no solution"))
+        if result.best is not None and not solver.check(result.best):
+            print("    but it doesn't clear the level when played back!")
+        print(
+            f"    {stats.layouts} layouts, {stats.duplicates} duplicates, {stats.simulated} simulated over {stats.beats} beats ({stats.cached} cached) "
+            f"({stats.deaths} died, {stats.cycles} cycled, {stats.bounded} bounded, {stats.timeouts} timed out) in {stats.seconds:.2f}s"
+        )
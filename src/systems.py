@@ -0,0 +1,101 @@
+import numpy as np
+from engine import Engine, NEIGHBORS
+from entity import Entity
+from entity_store import EntityKind
+from game_events import DoorOpened, EnemyKilled, KeyCollected, PlayerDamaged
+
+NEIGHBOR_DX = np.array([dx for dx, _ in NEIGHBORS])
+NEIGHBOR_DY = np.array([dy for _, dy in NEIGHBORS])
+
+class TurnSystems:
+    """
+    Runs an engine's turns as systems over its store's columns, instead of asking every Entity object to take its turn.
+    Each kind of entity is an archetype (engine.by_kind), and the systems work on the ids of one archetype at a time.
+    That's what keeps levels with thousands of enemies fast; attached as Engine.systems, move_player hands its turns to it.
+    The systems keep the engine's lookups (entities, by_kind, occupants) and hash up to date and emit the same events,
+    so the rest of the Engine API works the same either way.
+    """
+    engine: Engine
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def run_turn(self, dx: int, dy: int):
+        engine = self.engine
+        player = engine.player
+        if player is None:
+            return
+
+        bumped = self.movement(player, dx, dy)
+        if bumped is not None:
+            self.pickups(bumped)
+        engine.update_player_steps()
+        self.ai(player)
+
+    def movement(self, player: Entity, dx: int, dy: int) -> Entity | None:
+        """Moves the player, returning whatever it bumped into. It's only ever one entity, so this is just Entity.move."""
+        return player.move(self.engine, dx, dy)
+
+    def pickups(self, bumped: Entity):
+        """The player attacks enemies and picks up keys by walking into them"""
+        engine = self.engine
+        if bumped.kind == EntityKind.ENEMY:
+            engine.remove_entity(bumped)
+            engine.events.emit(EnemyKilled(bumped))
+        elif bumped.kind == EntityKind.KEY:
+            engine.remove_entity(bumped)
+            engine.events.emit(KeyCollected(bumped))
+            self.doors()
+
+    def doors(self):
+        """Opens every closed door"""
+        engine = self.engine
+        store = engine.store
+        ids = np.fromiter(engine.doors, dtype=np.intp, count=len(engine.doors))
+        closed = ids[np.frombuffer(store.open, dtype=store.open.typecode)[ids] == 0]
+        store.set_many("open", closed, np.ones(closed.size, dtype=np.int8))
+        for id in closed.tolist():
+            door = engine.doors[id]
+            door.update_tile()
+            engine.events.emit(DoorOpened(door))
+
+    def ai(self, player: Entity):
+        """Every enemy steps towards the player, or attacks if it's adjacent or has no way there"""
+        engine = self.engine
+        store = engine.store
+        ids = np.fromiter(engine.enemies, dtype=np.intp, count=len(engine.enemies))
+        if ids.size == 0:
+            return
+
+        x = np.frombuffer(store.x, dtype=store.x.typecode)[ids]
+        y = np.frombuffer(store.y, dtype=store.y.typecode)[ids]
+        direction = engine.player_steps[y, x]
+        attacks = direction < 0
+
+        attackers = int(attacks.sum())
+        health = player.health
+        player.health = max(health - attackers, 0)
+        for damaged in range(health, player.health, -1):
+            engine.events.emit(PlayerDamaged(1, damaged - 1))
+
+        moving = np.flatnonzero(~attacks)
+        target_x = x[moving] + NEIGHBOR_DX[direction[moving]]
+        target_y = y[moving] + NEIGHBOR_DY[direction[moving]]
+
+        # Enemies move one after another, since each one can block the ones after it
+        moved = []
+        occupants = engine.occupants
+        for i, (id, from_x, from_y, to_x, to_y) in enumerate(zip(ids[moving].tolist(), x[moving].tolist(), y[moving].tolist(), target_x.tolist(), target_y.tolist())):
+            enemy = engine.entity_table[id]
+            if engine.blocking_entity_at(to_x, to_y, enemy) is not None:
+                continue
+            cell = occupants[(from_x, from_y)]
+            cell.remove(enemy)
+            if not cell:
+                occupants.pop((from_x, from_y))
+            occupants.setdefault((to_x, to_y), []).append(enemy)
+            moved.append(i)
+
+        moved_ids = ids[moving[moved]]
+        store.set_many("x", moved_ids, target_x[moved])
+        store.set_many("y", moved_ids, target_y[moved])
@@ -1,84 +1,108 @@
-import random
-
-class Tile:
-    solid = False
-    def __init__(self, x: int, y: int, solid: bool, index: int) -> None:
-        self.x = x
-        self.y = y
-        self.solid = solid
-        self.index = index
-    
-    def draw(self, engine):
-        engine.draw_tile(self.x - engine.camera_x, self.y - engine.camera_y, self.index)
-    
-class EmptyTile(Tile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, False, random.randint(10, 13))
-
-class WallTile(Tile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, True, 20)
-
-class PitTile(Tile):
-    def __init__(self, x: int, y: int, index=None) -> None:
-        super().__init__(x, y, False, 49 if not index else index)
-
-class BackCornerLeftPitTile(PitTile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, 39)
-
-class BackCornerRightPitTile(PitTile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, 41)
-
-class FrontCornerRightPitTile(PitTile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, 59)
-
-class FrontCornerLeftPitTile(PitTile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, 57)
-
-class BackPitTile(PitTile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, 40)
-
-class FrontPitTile(PitTile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, 58)
-
-class LeftVerticalPitTile(PitTile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, 48)
-
-class RightVerticalPitTile(PitTile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, 50)
-
-class BackWallTile(Tile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, True, 2)
-
-class LeftVerticalWallTile(Tile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, True, 9)
-
-class RightVerticalWallTile(Tile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, True, 14)
-
-class FrontCornerLeftWallTile(Tile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, True, 18)
-
-class FrontCornerRightWallTile(Tile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, True, 23)
-
-class BackCornerLeftWallTile(Tile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, True, 0)
-
-class BackCornerRightWallTile(Tile):
-    def __init__(self, x: int, y: int) -> None:
-        super().__init__(x, y, True, 5)
+import functools
+import random
+from typing import ClassVar, Self
+
+class Tile:
+    """
+    A kind of terrain. Tiles don't know where they are, so every cell of the same type and variant shares one object;
+    get them with make() instead of constructing them.
+    """
+    __slots__ = ("index",)
+    index: int
+    "Which tile of the tileset this variant draws."
+    solid: ClassVar[bool] = False
+    variants: ClassVar[tuple[int, ...]] = ()
+    "The tileset indices this type can be drawn with. make() picks one at random."
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+
+    @classmethod
+    def make(cls) -> Self:
+        # Only roll for types that have a choice, so the floor comes out the same as it always has for a given seed
+        index = random.choice(cls.variants) if len(cls.variants) > 1 else cls.variants[0]
+        return shared_tile(cls, index)
+
+@functools.cache
+def shared_tile(tile_type: type[Tile], index: int) -> Tile:
+    return tile_type(index)
+
+class EmptyTile(Tile):
+    __slots__ = ()
+    variants = (10, 11, 12, 13)
+
+class WallTile(Tile):
+    __slots__ = ()
+    solid = True
+    variants = (20,)
+
+class PitTile(Tile):
+    __slots__ = ()
+    variants = (49,)
+
+class BackCornerLeftPitTile(PitTile):
+    __slots__ = ()
+    variants = (39,)
+
+class BackCornerRightPitTile(PitTile):
+    __slots__ = ()
+    variants = (41,)
+
+class FrontCornerRightPitTile(PitTile):
+    __slots__ = ()
+    variants = (59,)
+
+class FrontCornerLeftPitTile(PitTile):
+    __slots__ = ()
+    variants = (57,)
+
+class BackPitTile(PitTile):
+    __slots__ = ()
+    variants = (40,)
+
+class FrontPitTile(PitTile):
+    __slots__ = ()
+    variants = (58,)
+
+class LeftVerticalPitTile(PitTile):
+    __slots__ = ()
+    variants = (48,)
+
+class RightVerticalPitTile(PitTile):
+    __slots__ = ()
+    variants = (50,)
+
+class BackWallTile(Tile):
+    __slots__ = ()
+    solid = True
+    variants = (2,)
+
+class LeftVerticalWallTile(Tile):
+    __slots__ = ()
+    solid = True
+    variants = (9,)
+
+class RightVerticalWallTile(Tile):
+    __slots__ = ()
+    solid = True
+    variants = (14,)
+
+class FrontCornerLeftWallTile(Tile):
+    __slots__ = ()
+    solid = True
+    variants = (18,)
+
+class FrontCornerRightWallTile(Tile):
+    __slots__ = ()
+    solid = True
+    variants = (23,)
+
+class BackCornerLeftWallTile(Tile):
+    __slots__ = ()
+    solid = True
+    variants = (0,)
+
+class BackCornerRightWallTile(Tile):
+    __slots__ = ()
+    solid = True
+    variants = (5,)
@@ -0,0 +1,57 @@
+# Checks that batch_engine.BatchEngine plays every row exactly like the regular engine
+
+import random, sys
+from os import path
+
+import numpy as np
+
+sys.path.insert(0, path.normpath(path.join(path.dirname(__file__), "..", "src")))
+
+from batch_engine import BatchEngine
+from puzzle import Puzzle, puzzles
+from solver import MOVES, Solver
+
+def check_against_engine(puzzle: Puzzle, samples: int = 200, seed: int = 0) -> int:
+    """
+    Plays a random sample of the puzzle's layouts on both a BatchEngine and the regular engine, comparing every entity
+    after every beat. Returns how many rows ever disagreed.
+    """
+    solver = Solver(puzzle)
+    layouts = list(solver.layouts())
+    layouts = random.Random(seed).sample(layouts, min(samples, len(layouts)))
+    codes = np.array([np.frombuffer(solver.moves(placements), dtype=np.uint8) for placements in layouts])
+
+    batch = BatchEngine(solver.engine, len(layouts))
+    move_dx = np.array([move[0] if move is not None else 0 for move in MOVES])
+    move_dy = np.array([move[1] if move is not None else 0 for move in MOVES])
+    move_acts = np.array([move is not None for move in MOVES])
+
+    engines = [puzzle.make_engine() for _ in layouts]
+
+    mismatched = np.zeros(len(layouts), dtype=bool)
+    for beat in range(codes.shape[1]):
+        beat_codes = codes[:, beat]
+        batch.step(move_dx[beat_codes], move_dy[beat_codes], move_acts[beat_codes])
+
+        for row, engine in enumerate(engines):
+            move = MOVES[beat_codes[row]]
+            if move is not None:
+                engine.move_player(*move)
+            state = engine.export_state()
+            mismatched[row] |= not (
+                np.array_equal(batch.x[row], state.x) and np.array_equal(batch.y[row], state.y)
+                and np.array_equal(batch.health[row], state.health) and np.array_equal(batch.open[row], np.array(state.open, dtype=bool))
+                and np.array_equal(batch.alive[row], np.array(state.alive, dtype=bool))
+            )
+            mismatched[row] |= batch.all_enemies_dead()[row] != engine.all_enemies_dead()
+
+    return int(mismatched.sum())
+
+if __name__ == "__main__":
+    # python tools/batch_check.py [samples]
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for puzzle in puzzles:
+        mismatches = check_against_engine(puzzle, samples)
+        print(f"{puzzle.name}: {mismatches} layouts disagreed with the engine")
+        if mismatches:
+            sys.exit(1)
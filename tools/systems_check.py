@@ -0,0 +1,90 @@
+# Checks that systems.TurnSystems plays turns exactly like the regular engine, then times both on a crowded level
+
+import random, sys, time
+from os import path
+
+import numpy as np
+
+sys.path.insert(0, path.normpath(path.join(path.dirname(__file__), "..", "src")))
+
+from engine import Engine
+from entity import DoorEntity, PlayerEntity, RatEntity, KeyEntity
+from game_events import DoorOpened, EnemyKilled, KeyCollected, PlayerDamaged
+from puzzle import puzzles
+from solver import MOVES, Solver
+from systems import TurnSystems
+from tile import EmptyTile, PitTile, WallTile
+
+def check_against_engine(engine: Engine, systems_engine: Engine, timelines: "list[list[tuple[int, int] | None]]") -> int:
+    """
+    Plays each timeline's moves from the starting state on both an engine and one using TurnSystems,
+    returning how many beats they disagreed after on entities or events.
+    """
+    events: list[list] = [[], []]
+    for i, e in enumerate((engine, systems_engine)):
+        for event_type in (EnemyKilled, KeyCollected, DoorOpened, PlayerDamaged):
+            e.events.subscribe(event_type, events[i].append)
+
+    starting_state = engine.export_state()
+    mismatches = 0
+    for moves in timelines:
+        engine.import_state(starting_state)
+        systems_engine.import_state(starting_state)
+        for move in moves:
+            events[0].clear()
+            events[1].clear()
+            if move is not None:
+                engine.move_player(*move)
+                systems_engine.move_player(*move)
+            mismatches += (
+                engine.state_hash != systems_engine.state_hash
+                or engine.occupants.keys() != systems_engine.occupants.keys()
+                or [type(event) for event in events[0]] != [type(event) for event in events[1]]
+            )
+    return mismatches
+
+def crowded_level(entities: int, size: int, systems: bool, seed: int = 0) -> Engine:
+    """A big random level packed with rats, with the odd key and door, for seeing how turns scale"""
+    rng = random.Random(seed)
+    engine = Engine(size, size)
+    if systems:
+        engine.systems = TurnSystems(engine)
+    world = [[WallTile.make() if rng.random() < 0.08 else PitTile.make() if rng.random() < 0.02 else EmptyTile.make() for _ in range(size)] for _ in range(size)]
+    engine.set_world(world)
+
+    cells = list(zip(*np.nonzero(engine.walkable)))
+    rng.shuffle(cells)
+    y, x = cells.pop()
+    engine.player = PlayerEntity(int(x), int(y))
+    engine.player.health = 1 << 20
+    engine.add_entity(engine.player)
+    for _ in range(entities):
+        y, x = cells.pop()
+        roll = rng.random()
+        engine.add_entity(KeyEntity(int(x), int(y)) if roll < 0.01 else DoorEntity(int(x), int(y)) if roll < 0.03 else RatEntity(int(x), int(y)))
+    return engine
+
+if __name__ == "__main__":
+    # python tools/systems_check.py [entities]
+    entities = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for puzzle in puzzles:
+        solver = Solver(puzzle)
+        timelines = [[MOVES[code] for code in solver.moves(placements)] for placements in list(solver.layouts())[:200]]
+        mismatches = check_against_engine(puzzle.make_engine(), puzzle.make_engine(systems=True), timelines)
+        print(f"{puzzle.name}: {mismatches} beats disagreed with the engine")
+        if mismatches:
+            sys.exit(1)
+
+    rng = random.Random(0)
+    moves = [rng.choice(MOVES) for _ in range(200)]
+    for systems in (False, True):
+        engine = crowded_level(entities, 150, systems)
+        start = time.perf_counter()
+        for move in moves:
+            if move is not None:
+                engine.move_player(*move)
+        print(f"{entities} entities, systems={systems}: {(time.perf_counter() - start) / len(moves) * 1000:.2f}ms per turn")
+
+    mismatches = check_against_engine(crowded_level(entities, 150, False), crowded_level(entities, 150, True), [moves])
+    print(f"crowded level: {mismatches} beats disagreed with the engine")
+    sys.exit(1 if mismatches else 0)